@@ -0,0 +1,110 @@
+from aioclickhouse.constants import (
+    DEFAULT_INSERT_BLOCK_SIZE,
+    DEFAULT_INSERT_BLOCK_MIN_BYTES,
+    DEFAULT_INSERT_BLOCK_MAX_BYTES,
+    DEFAULT_INSERT_BLOCK_INITIAL_BYTES,
+)
+
+
+def estimate_row_size(row):
+    """
+    Rough size of row in Native format: strings and bytes are length
+    prefixed, everything else is counted as 8 bytes.
+    """
+    size = 0
+    for value in row:
+        if isinstance(value, str):
+            size += len(value) + 1
+        elif isinstance(value, (bytes, bytearray)):
+            size += len(value) + 1
+        elif isinstance(value, (list, tuple)):
+            size += 8 + estimate_row_size(value)
+        else:
+            size += 8
+    return size
+
+
+class AdaptiveBlockSize:
+    """
+    Picks insert block size in encoded bytes and tunes it online.
+
+    After each block call update() with its encoded size, time spent
+    sending it and time until server acknowledged it. Effective throughput
+    (bytes per second of send plus acknowledgement) is hill-climbed:
+    block size keeps moving in the same direction while throughput grows
+    and turns back when it drops. Size always stays within bounds.
+    """
+    def __init__(self, min_bytes=DEFAULT_INSERT_BLOCK_MIN_BYTES,
+                 max_bytes=DEFAULT_INSERT_BLOCK_MAX_BYTES,
+                 initial_bytes=DEFAULT_INSERT_BLOCK_INITIAL_BYTES,
+                 min_rows=1, max_rows=DEFAULT_INSERT_BLOCK_SIZE,
+                 step=1.5, tolerance=0.05, smoothing=0.5):
+        if not 0 < min_bytes <= max_bytes:
+            raise ValueError('Expected 0 < min_bytes <= max_bytes')
+        if not 0 < min_rows <= max_rows:
+            raise ValueError('Expected 0 < min_rows <= max_rows')
+
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.min_rows = min_rows
+        self.max_rows = max_rows
+        self.step = step
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+
+        self.target_bytes = self._clamp(initial_bytes)
+        self.throughput = None
+        self._direction = 1
+
+    def _clamp(self, n_bytes):
+        return int(min(max(n_bytes, self.min_bytes), self.max_bytes))
+
+    def rows_for(self, row_size):
+        """
+        Number of rows of given average encoded size to put into next block.
+        """
+        rows = self.target_bytes // max(int(row_size), 1)
+        return min(max(rows, self.min_rows), self.max_rows)
+
+    def update(self, n_bytes, send_time, ack_time=0.0):
+        elapsed = send_time + ack_time
+        if elapsed <= 0 or n_bytes <= 0:
+            return
+
+        throughput = n_bytes / elapsed
+        if self.throughput is not None:
+            if throughput < self.throughput * (1 - self.tolerance):
+                self._direction = -self._direction
+            self.throughput += self.smoothing * (throughput - self.throughput)
+        else:
+            self.throughput = throughput
+
+        if self._direction > 0:
+            target = self.target_bytes * self.step
+        else:
+            target = self.target_bytes / self.step
+
+        # Size stays at the bound while it's the best one seen.
+        self.target_bytes = self._clamp(target)
+
+    def iter_blocks(self, rows, row_size=estimate_row_size):
+        """
+        Splits rows into blocks of about current target size. Block is
+        closed once it reaches target size and has at least min_rows rows,
+        or when it has max_rows rows. Target is re-read for every block,
+        so update() calls made between blocks take effect immediately.
+        """
+        block = []
+        block_bytes = 0
+        for row in rows:
+            block.append(row)
+            block_bytes += row_size(row)
+            if (len(block) >= self.max_rows or
+                    (block_bytes >= self.target_bytes and
+                     len(block) >= self.min_rows)):
+                yield block
+                block = []
+                block_bytes = 0
+
+        if block:
+            yield block
@@ -0,0 +1,121 @@
+import asyncio
+
+from aioclickhouse.exceptions import QueryCancelledError
+
+_END = object()
+
+
+class _Flight:
+    """
+    Single execution of query shared by subscribers.
+    """
+    def __init__(self, key, stream_factory, on_done, max_buffered_blocks):
+        self.key = key
+        self.queues = set()
+        self.started = False
+        # Set once the flight can't take new subscribers: it's finished or
+        # its last subscriber has gone away.
+        self.closed = False
+        self.max_buffered_blocks = max_buffered_blocks
+        self._on_done = on_done
+        self.task = asyncio.ensure_future(self._run(stream_factory))
+
+    async def _run(self, stream_factory):
+        try:
+            async for block in stream_factory():
+                self.started = True
+                for queue in list(self.queues):
+                    await queue.put((block, None))
+
+        except asyncio.CancelledError:
+            self._abort(QueryCancelledError('Shared query was cancelled'))
+            raise
+
+        except Exception as e:
+            self._abort(e)
+
+        else:
+            for queue in list(self.queues):
+                await queue.put(_END)
+
+        finally:
+            self.closed = True
+            self._on_done(self)
+
+    def _abort(self, exc):
+        for queue in self.queues:
+            # Partial result is useless, error is delivered right away.
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait((None, exc))
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.max_buffered_blocks)
+        self.queues.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.queues.discard(queue)
+        # Wake up the flight if it's blocked on this queue being full.
+        while not queue.empty():
+            queue.get_nowait()
+        if not self.queues and not self.task.done():
+            self.closed = True
+            self._on_done(self)
+            self.task.cancel()
+
+
+class QueryCoalescer:
+    """
+    Shares one server execution between concurrent identical queries.
+
+    stream_factory passed to stream() must return async iterator of
+    blocks. It's called once per flight; cancelling the iterator must
+    cancel query on the server. Waiters can join a flight until it yields
+    its first block, later identical queries start a new flight.
+    Flight is cancelled when the last of its waiters has gone away.
+
+    Every waiter has its own queue of blocks not consumed yet. By default
+    queues are unbounded: one slow waiter may buffer the whole result in
+    memory while the others stream. With max_buffered_blocks queues are
+    bounded instead and the shared execution proceeds at the pace of the
+    slowest waiter.
+    """
+    def __init__(self, max_buffered_blocks=None):
+        self.max_buffered_blocks = max_buffered_blocks or 0
+        self._flights = {}
+
+    @staticmethod
+    def make_key(query, settings=None, database=None):
+        settings = tuple(sorted((settings or {}).items()))
+        return query, settings, database
+
+    def _flight_done(self, flight):
+        if self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    @property
+    def in_flight(self):
+        return len(self._flights)
+
+    async def stream(self, key, stream_factory):
+        flight = self._flights.get(key)
+        if flight is None or flight.started or flight.closed:
+            flight = _Flight(key, stream_factory, self._flight_done,
+                             self.max_buffered_blocks)
+            self._flights[key] = flight
+
+        queue = flight.subscribe()
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+
+                block, exc = item
+                if exc is not None:
+                    raise exc
+                yield block
+
+        finally:
+            flight.unsubscribe(queue)
@@ -0,0 +1,156 @@
+import asyncio
+from collections.abc import Sequence
+
+from aioclickhouse.columns.base import Column
+from aioclickhouse.columns.intcolumn import UInt64Column
+
+
+class FlatArrayData(Sequence):
+    """
+    Decoded Array column as is on the wire: flat values of all rows
+    plus end offset of every row. Row is sliced out of values on access.
+    """
+    __slots__ = ('offsets', 'values', 'first_start')
+
+    def __init__(self, offsets, values, first_start=0):
+        self.offsets = offsets
+        self.values = values
+        self.first_start = first_start
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _start(self, i):
+        return self.offsets[i - 1] if i else self.first_start
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, _, step = item.indices(len(self.offsets))
+            if step != 1:
+                return [self[i] for i in range(len(self))[item]]
+            first_start = self._start(start) if start < len(self) else 0
+            return FlatArrayData(self.offsets[item], self.values, first_start)
+
+        if item < 0:
+            item += len(self.offsets)
+        if not 0 <= item < len(self.offsets):
+            raise IndexError('FlatArrayData index out of range')
+        return self.values[self._start(item):self.offsets[item]]
+
+
+class ArrayColumn(Column):
+    """
+    Array(T) is serialized as UInt64 end offsets of all rows followed by
+    flattened values of nested column.
+    """
+    py_types = (list, tuple)
+
+    def __init__(self, nested_column, **kwargs):
+        self.nested_column = nested_column
+        super(ArrayColumn, self).__init__(**kwargs)
+        self.offsets_column = UInt64Column(memory_budget=self.memory_budget)
+
+    @property
+    def ch_type(self):
+        return 'Array({})'.format(self.nested_column.ch_type)
+
+    async def read_state_prefix(self, reader: asyncio.StreamReader):
+        await self.nested_column.read_state_prefix(reader)
+
+    def write_state_prefix(self, writer: asyncio.StreamWriter):
+        self.nested_column.write_state_prefix(writer)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        offsets = await self.offsets_column.read_data(n_items, reader)
+        n_values = offsets[-1] if n_items else 0
+        values = await self.nested_column.read_data(n_values, reader)
+        return FlatArrayData(offsets, values)
+
+    def write_data(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, FlatArrayData):
+            end = items.offsets[-1] if len(items) else items.first_start
+            offsets = items.offsets
+            if items.first_start:
+                offsets = [x - items.first_start for x in offsets]
+            values = items.values[items.first_start:end]
+
+        else:
+            for item in items:
+                self.check_item(item)
+
+            offsets = []
+            values = []
+            for item in items:
+                values.extend(item)
+                offsets.append(len(values))
+
+        self.offsets_column.write_data(offsets, writer)
+        self.nested_column.write_data(values, writer)
+
+
+class TupleData(Sequence):
+    """
+    Decoded Tuple column: one decoded column per tuple element.
+    Row tuple is assembled on access.
+    """
+    __slots__ = ('columns', 'names')
+
+    def __init__(self, columns, names=None):
+        self.columns = columns
+        self.names = names
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return TupleData([x[item] for x in self.columns], self.names)
+        return tuple(x[item] for x in self.columns)
+
+    def __iter__(self):
+        return zip(*self.columns)
+
+
+class TupleColumn(Column):
+    py_types = (list, tuple)
+
+    def __init__(self, nested_columns, names=None, **kwargs):
+        self.nested_columns = nested_columns
+        self.names = names
+        super(TupleColumn, self).__init__(**kwargs)
+
+    @property
+    def ch_type(self):
+        types = [x.ch_type for x in self.nested_columns]
+        if self.names:
+            types = [
+                '{} {}'.format(name, t) for name, t in zip(self.names, types)
+            ]
+        return 'Tuple({})'.format(', '.join(types))
+
+    async def read_state_prefix(self, reader: asyncio.StreamReader):
+        for column in self.nested_columns:
+            await column.read_state_prefix(reader)
+
+    def write_state_prefix(self, writer: asyncio.StreamWriter):
+        for column in self.nested_columns:
+            column.write_state_prefix(writer)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        columns = []
+        for column in self.nested_columns:
+            columns.append(await column.read_data(n_items, reader))
+        return TupleData(columns, self.names)
+
+    def write_data(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, TupleData):
+            columns = items.columns
+        else:
+            for item in items:
+                self.check_item(item)
+            columns = list(zip(*items)) if items else [
+                () for _ in self.nested_columns
+            ]
+
+        for column, values in zip(self.nested_columns, columns):
+            column.write_data(values, writer)
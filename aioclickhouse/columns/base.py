@@ -0,0 +1,103 @@
+import asyncio
+import sys
+from array import array
+from collections.abc import Sequence
+
+from aioclickhouse.exceptions import TypeMismatchError
+
+
+class Column:
+    ch_type = None
+    py_types = None
+    null_value = 0
+
+    def __init__(self, types_check=False, memory_budget=None, **kwargs):
+        self.nullable = False
+        self.types_check_enabled = types_check
+        self.memory_budget = memory_budget
+
+    def check_item(self, value):
+        if self.types_check_enabled and not isinstance(value, self.py_types):
+            raise TypeMismatchError(
+                '{} for column "{}"'.format(value, self.ch_type)
+            )
+
+    async def read_state_prefix(self, reader: asyncio.StreamReader):
+        pass
+
+    def write_state_prefix(self, writer: asyncio.StreamWriter):
+        pass
+
+    async def read_data(self, n_items, reader: asyncio.StreamReader):
+        return await self.read_items(n_items, reader)
+
+    def write_data(self, items, writer: asyncio.StreamWriter):
+        for item in items:
+            self.check_item(item)
+        self.write_items(items, writer)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        raise NotImplementedError
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        raise NotImplementedError
+
+
+class ConvertedData(Sequence):
+    """
+    Raw decoded values (array or spilled memoryview) converted to Python
+    objects only on access. convert takes sequence of raw values and
+    returns list.
+    """
+    __slots__ = ('raw', 'convert')
+
+    chunk_size = 65536
+
+    def __init__(self, raw, convert):
+        self.raw = raw
+        self.convert = convert
+
+    def __len__(self):
+        return len(self.raw)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return ConvertedData(self.raw[item], self.convert)
+        return self.convert([self.raw[item]])[0]
+
+    def __iter__(self):
+        for start in range(0, len(self.raw), self.chunk_size):
+            yield from self.convert(self.raw[start:start + self.chunk_size])
+
+
+class FormatColumn(Column):
+    """
+    Fixed size values, decoded in bulk into array.array with given typecode.
+    """
+    format = None
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        items = array(self.format)
+        if n_items:
+            items.frombytes(
+                await reader.readexactly(n_items * items.itemsize)
+            )
+            if sys.byteorder == 'big':
+                items.byteswap()
+            if self.memory_budget is not None:
+                return self.memory_budget.hold(items)
+        return items
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, memoryview) and items.format == self.format:
+            if sys.byteorder == 'little':
+                writer.write(items.cast('B'))
+                return
+            items = array(self.format, items)
+
+        if not isinstance(items, array) or items.typecode != self.format:
+            items = array(self.format, items)
+        if sys.byteorder == 'big':
+            items = array(self.format, items)
+            items.byteswap()
+        writer.write(items.tobytes())
@@ -0,0 +1,368 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from itertools import repeat
+from operator import floordiv, mul
+
+from aioclickhouse.columns.base import ConvertedData, FormatColumn
+
+try:
+    from zoneinfo import ZoneInfo as get_timezone
+except ImportError:
+    from pytz import timezone as get_timezone
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Transition tables are built by probing timezone offset once a day and
+# cover whole years.
+TRANSITION_PROBE_STEP = 86400
+TRANSITION_TABLE_GRANULARITY = 366 * 86400
+
+# Values are deduplicated when sample from the beginning of column
+# contains at least this share of repeated values.
+DEDUPLICATION_SAMPLE_SIZE = 1024
+DEDUPLICATION_MIN_REPEATED = 0.5
+
+
+def _is_repetitive(items):
+    sample = items[:DEDUPLICATION_SAMPLE_SIZE]
+    return len(set(sample)) <= len(sample) * (1 - DEDUPLICATION_MIN_REPEATED)
+
+
+def _convert_bulk(convert, items):
+    """
+    Converts items with convert(iterable) -> list. Time series usually
+    have many equal values in a row, such columns are converted once per
+    distinct value and converted objects are shared.
+    """
+    if not _is_repetitive(items):
+        return convert(items)
+
+    distinct = dict.fromkeys(items)
+    converted = dict(zip(distinct, convert(distinct)))
+    return list(map(converted.__getitem__, items))
+
+
+def _convert(func, items, *args):
+    """
+    Applies func(item, *args) to every item with C-level map.
+    """
+    extra = [repeat(arg) for arg in args]
+    return _convert_bulk(lambda x: list(map(func, x, *extra)), items)
+
+
+class TransitionTable:
+    """
+    UTC offsets of timezone: offsets[i] seconds are in effect from
+    starts[i] until starts[i + 1] UTC seconds since epoch. Table is built
+    by probing tzinfo, so any tzinfo implementation works, and is extended
+    on demand to cover requested range.
+    """
+    def __init__(self, tz):
+        self.tz = tz
+        self.start = self.end = None
+        self.starts = self.offsets = None
+
+    def offset_at(self, timestamp):
+        offset = datetime.fromtimestamp(timestamp, self.tz).utcoffset()
+        return offset.days * 86400 + offset.seconds
+
+    def cover(self, start, end):
+        if self.start is not None and self.start <= start and end <= self.end:
+            return
+
+        if self.start is not None:
+            start, end = min(start, self.start), max(end, self.end)
+        granularity = TRANSITION_TABLE_GRANULARITY
+        start = start // granularity * granularity
+        end = -(-(end + 1) // granularity) * granularity
+
+        starts = [start]
+        offsets = [self.offset_at(start)]
+        probe = start
+        while probe < end:
+            next_probe = min(probe + TRANSITION_PROBE_STEP, end)
+            offset = self.offset_at(next_probe)
+            if offset != offsets[-1]:
+                # Find the first second of new offset.
+                lo, hi = probe, next_probe
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if self.offset_at(mid) == offsets[-1]:
+                        lo = mid
+                    else:
+                        hi = mid
+                starts.append(hi)
+                offsets.append(offset)
+            probe = next_probe
+
+        self.start, self.end = start, end
+        self.starts = np.array(starts, dtype='q')
+        self.offsets = np.array(offsets, dtype='q')
+
+    def utc_offsets(self, ticks, ticks_per_second=1):
+        """
+        Offsets (in ticks) for int64 array of UTC ticks since epoch, or None
+        if they are all zero.
+        """
+        if not len(ticks):
+            return None
+
+        self.cover(int(ticks.min()) // ticks_per_second,
+                   int(ticks.max()) // ticks_per_second)
+        if not self.offsets.any():
+            return None
+
+        indexes = np.searchsorted(
+            self.starts, ticks // ticks_per_second, side='right'
+        ) - 1
+        return self.offsets[indexes] * ticks_per_second
+
+    def local_offsets(self, ticks, ticks_per_second=1):
+        """
+        Offsets (in ticks) for int64 array of local ticks since epoch, or
+        None if they are all zero. Wall time repeated when clocks go back is
+        taken as the first of the two.
+        """
+        offsets = self.utc_offsets(ticks, ticks_per_second)
+        if offsets is None:
+            return None
+        return self.utc_offsets(ticks - offsets, ticks_per_second)
+
+
+_transition_tables = {}
+
+
+def get_transition_table(tz):
+    table = _transition_tables.get(tz)
+    if table is None:
+        table = _transition_tables[tz] = TransitionTable(tz)
+    return table
+
+
+def days_to_dates(days):
+    return _convert_bulk(
+        lambda x: list(map(date.fromordinal, map(EPOCH_ORDINAL.__add__, x))),
+        days
+    )
+
+
+def to_datetimes(timestamps, tz):
+    """
+    Converts seconds (int or float) since epoch to datetimes in tz.
+    Offsets are resolved by tzinfo: ZoneInfo keeps transitions of the zone
+    and looks them up in C.
+    """
+    return _convert(datetime.fromtimestamp, timestamps, tz)
+
+
+def micros_to_datetimes(micros, tz):
+    """
+    Converts microseconds since epoch to datetimes in tz. Done with
+    integer arithmetic to stay exact for any DateTime64 range.
+    """
+    def convert(items):
+        deltas = map(timedelta, repeat(0), repeat(0), items)
+        return list(map(
+            datetime.astimezone, map(EPOCH.__add__, deltas), repeat(tz)
+        ))
+
+    return _convert_bulk(convert, micros)
+
+
+def _hold_numpy(memory_budget, items):
+    """
+    Accounts datetime64 array made from raw column values, which are
+    accounted already. Array past the limit is spilled and viewed from disk.
+    """
+    if memory_budget is None:
+        return items
+
+    # Buffer protocol doesn't support datetime64, all its units are 8 bytes.
+    raw = items.view('q')
+    held = memory_budget.hold_bytes(raw)
+    if held is raw:
+        return items
+    return np.frombuffer(held, 'q').view(items.dtype)
+
+
+class DateColumn(FormatColumn):
+    ch_type = 'Date'
+    py_types = (date, )
+    format = 'H'
+    null_value = date(1970, 1, 1)
+
+    def __init__(self, use_numpy=False, **kwargs):
+        self.use_numpy = use_numpy and np is not None
+        super(DateColumn, self).__init__(**kwargs)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        days = await super(DateColumn, self).read_items(n_items, reader)
+        if self.use_numpy:
+            return _hold_numpy(
+                self.memory_budget,
+                np.frombuffer(days, self.format).astype('datetime64[D]')
+            )
+        elif self.memory_budget is not None:
+            # Keep accounted (or spilled) raw values, convert on access.
+            return ConvertedData(days, days_to_dates)
+
+        return days_to_dates(days)
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, ConvertedData):
+            items = items.raw
+        elif np is not None and isinstance(items, np.ndarray):
+            items = items.astype('datetime64[D]').astype(self.format)
+        else:
+            items = [
+                x if isinstance(x, int) else x.toordinal() - EPOCH_ORDINAL
+                for x in items
+            ]
+        super(DateColumn, self).write_items(items, writer)
+
+
+class Date32Column(DateColumn):
+    ch_type = 'Date32'
+    format = 'i'
+
+
+class DateTimeColumn(FormatColumn):
+    """
+    Seconds since epoch. Decoded as timezone-aware datetimes in column
+    or server timezone, or as numpy datetime64 array of wall time in that
+    timezone. Offsets for numpy arrays are looked up in bulk in cached
+    transition table of the timezone.
+    """
+    ch_type = 'DateTime'
+    py_types = (datetime, int)
+    format = 'I'
+    null_value = EPOCH
+
+    def __init__(self, timezone=None, server_timezone=None, use_numpy=False,
+                 **kwargs):
+        self.timezone = timezone or server_timezone or 'UTC'
+        self.tz = get_timezone(self.timezone)
+        self.use_numpy = use_numpy and np is not None
+        super(DateTimeColumn, self).__init__(**kwargs)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        items = await super(DateTimeColumn, self).read_items(n_items, reader)
+        if self.use_numpy:
+            items = np.frombuffer(items, self.format).astype('q')
+            offsets = get_transition_table(self.tz).utc_offsets(items)
+            if offsets is not None:
+                items += offsets
+            return _hold_numpy(self.memory_budget, items.view('datetime64[s]'))
+        elif self.memory_budget is not None:
+            return ConvertedData(items, self.to_datetimes)
+        return self.to_datetimes(items)
+
+    def to_datetimes(self, items):
+        return to_datetimes(items, self.tz)
+
+    def to_timestamp(self, value):
+        if isinstance(value, int):
+            return value
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=self.tz)
+        return int(value.timestamp())
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, ConvertedData):
+            items = items.raw
+        elif np is not None and isinstance(items, np.ndarray):
+            items = items.astype('datetime64[s]').astype('q')
+            offsets = get_transition_table(self.tz).local_offsets(items)
+            if offsets is not None:
+                items = items - offsets
+            items = items.astype(self.format)
+        else:
+            items = [self.to_timestamp(x) for x in items]
+        super(DateTimeColumn, self).write_items(items, writer)
+
+
+class DateTime64Column(DateTimeColumn):
+    """
+    Ticks of 10 ** -scale seconds since epoch.
+    """
+    ch_type = 'DateTime64'
+    format = 'q'
+    numpy_units = {0: 's', 3: 'ms', 6: 'us', 9: 'ns'}
+
+    def __init__(self, scale=3, **kwargs):
+        self.scale = scale
+        self.ticks = 10 ** scale
+        super(DateTime64Column, self).__init__(**kwargs)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        items = await FormatColumn.read_items(self, n_items, reader)
+
+        if self.use_numpy:
+            items = np.frombuffer(items, self.format)
+            offsets = get_transition_table(self.tz).utc_offsets(
+                items, self.ticks
+            )
+            unit_scale = self.numpy_unit_scale
+            dtype = 'datetime64[{}]'.format(self.numpy_units[unit_scale])
+            if offsets is None and unit_scale == self.scale:
+                # Zero-copy view over held (maybe spilled) ticks.
+                return items.view(dtype)
+
+            if offsets is not None:
+                items = items + offsets
+            if unit_scale != self.scale:
+                items = items * 10 ** (unit_scale - self.scale)
+            return _hold_numpy(self.memory_budget, items.view(dtype))
+        elif self.memory_budget is not None:
+            return ConvertedData(items, self.to_datetimes)
+        return self.to_datetimes(items)
+
+    @property
+    def numpy_unit_scale(self):
+        """
+        The nearest scale numpy has unit for.
+        """
+        return min(x for x in self.numpy_units if x >= self.scale)
+
+    def to_datetimes(self, items):
+        ticks = self.ticks
+        if self.scale > 6:
+            # Sub-microsecond part is truncated.
+            items = list(map(floordiv, items, repeat(ticks // 1000000)))
+        elif self.scale < 6:
+            items = list(map(mul, items, repeat(1000000 // ticks)))
+        return micros_to_datetimes(items, self.tz)
+
+    def to_timestamp(self, value):
+        if isinstance(value, int):
+            return value
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=self.tz)
+        delta = value - EPOCH
+        seconds = delta.days * 86400 + delta.seconds
+        return seconds * self.ticks + value.microsecond * self.ticks // 1000000
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, ConvertedData):
+            items = items.raw
+        elif np is not None and isinstance(items, np.ndarray):
+            unit_scale = self.numpy_unit_scale
+            items = items.astype('datetime64[{}]'.format(
+                self.numpy_units[unit_scale]
+            )).astype('q')
+            items = items // 10 ** (unit_scale - self.scale)
+            offsets = get_transition_table(self.tz).local_offsets(
+                items, self.ticks
+            )
+            if offsets is not None:
+                items = items - offsets
+        else:
+            items = [self.to_timestamp(x) for x in items]
+        FormatColumn.write_items(self, items, writer)
@@ -0,0 +1,15 @@
+from aioclickhouse.columns.base import FormatColumn
+
+
+class FloatColumn(FormatColumn):
+    py_types = (float, int)
+
+
+class Float32Column(FloatColumn):
+    ch_type = 'Float32'
+    format = 'f'
+
+
+class Float64Column(FloatColumn):
+    ch_type = 'Float64'
+    format = 'd'
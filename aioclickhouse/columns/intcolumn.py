@@ -0,0 +1,45 @@
+from aioclickhouse.columns.base import FormatColumn
+
+
+class IntColumn(FormatColumn):
+    py_types = (int, )
+
+
+class Int8Column(IntColumn):
+    ch_type = 'Int8'
+    format = 'b'
+
+
+class Int16Column(IntColumn):
+    ch_type = 'Int16'
+    format = 'h'
+
+
+class Int32Column(IntColumn):
+    ch_type = 'Int32'
+    format = 'i'
+
+
+class Int64Column(IntColumn):
+    ch_type = 'Int64'
+    format = 'q'
+
+
+class UInt8Column(IntColumn):
+    ch_type = 'UInt8'
+    format = 'B'
+
+
+class UInt16Column(IntColumn):
+    ch_type = 'UInt16'
+    format = 'H'
+
+
+class UInt32Column(IntColumn):
+    ch_type = 'UInt32'
+    format = 'I'
+
+
+class UInt64Column(IntColumn):
+    ch_type = 'UInt64'
+    format = 'Q'
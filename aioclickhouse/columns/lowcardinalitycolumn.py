@@ -0,0 +1,160 @@
+import asyncio
+from array import array
+from collections.abc import Sequence
+
+from aioclickhouse.columns.base import Column
+from aioclickhouse.columns.intcolumn import (
+    UInt8Column, UInt16Column, UInt32Column, UInt64Column
+)
+from aioclickhouse.reader import read_binary_uint64
+from aioclickhouse.writer import write_binary_uint64
+
+
+class LowCardinalityData(Sequence):
+    """
+    Dictionary-encoded column data: shared dictionary plus compact array of
+    indexes into it. Values are looked up only on access. For Nullable
+    nested type index 0 means NULL (dictionary keeps default value there).
+    """
+    __slots__ = ('dictionary', 'indexes', 'nullable')
+
+    def __init__(self, dictionary, indexes, nullable=False):
+        self.dictionary = dictionary
+        self.indexes = indexes
+        self.nullable = nullable
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return LowCardinalityData(
+                self.dictionary, self.indexes[item], self.nullable
+            )
+        index = self.indexes[item]
+        if self.nullable and not index:
+            return None
+        return self.dictionary[index]
+
+    def __iter__(self):
+        values = map(self.dictionary.__getitem__, self.indexes)
+        if not self.nullable:
+            return values
+        return (
+            None if not index else value
+            for index, value in zip(self.indexes, values)
+        )
+
+    @property
+    def null_map(self):
+        if not self.nullable:
+            return bytes(len(self.indexes))
+        return bytes(x == 0 for x in self.indexes)
+
+
+class LowCardinalityColumn(Column):
+    """
+    Stores column as dictionary with indexes instead of values.
+
+    Serialization contains dictionary (keys of nested type) and
+    indexes with width depending on dictionary size.
+    """
+    int_types = {
+        0: UInt8Column,
+        1: UInt16Column,
+        2: UInt32Column,
+        3: UInt64Column,
+    }
+    int_type_limits = (1 << 8, 1 << 16, 1 << 32)
+
+    # Single dictionary shared between all granules of a block.
+    shared_dictionaries_with_additional_keys = 1
+    has_additional_keys_bit = 1 << 9
+    need_update_dictionary = 1 << 10
+    serialization_type = has_additional_keys_bit | need_update_dictionary
+
+    def __init__(self, nested_column, nullable=False, **kwargs):
+        self.nested_column = nested_column
+        super(LowCardinalityColumn, self).__init__(**kwargs)
+        self.dictionary_nullable = nullable
+
+    @property
+    def ch_type(self):
+        nested = self.nested_column.ch_type
+        if self.dictionary_nullable:
+            nested = 'Nullable({})'.format(nested)
+        return 'LowCardinality({})'.format(nested)
+
+    async def read_state_prefix(self, reader: asyncio.StreamReader):
+        # Key serialization version.
+        await read_binary_uint64(reader)
+
+    def write_state_prefix(self, writer: asyncio.StreamWriter):
+        write_binary_uint64(self.shared_dictionaries_with_additional_keys,
+                            writer)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        if not n_items:
+            return LowCardinalityData([], array('B'), self.dictionary_nullable)
+
+        serialization_type = await read_binary_uint64(reader)
+        int_column = self.int_types[serialization_type & 0xf](
+            memory_budget=self.memory_budget
+        )
+
+        dictionary_size = await read_binary_uint64(reader)
+        dictionary = await self.nested_column.read_data(
+            dictionary_size, reader
+        )
+
+        # Number of indexes, equals to n_items.
+        await read_binary_uint64(reader)
+        indexes = await int_column.read_data(n_items, reader)
+
+        return LowCardinalityData(
+            dictionary, indexes, self.dictionary_nullable
+        )
+
+    def write_data(self, items, writer: asyncio.StreamWriter):
+        if not items:
+            return
+
+        if (isinstance(items, LowCardinalityData) and
+                items.nullable == self.dictionary_nullable):
+            dictionary = items.dictionary
+            indexes = items.indexes
+        else:
+            dictionary, indexes = self._encode(items)
+
+        int_type = 0
+        while (int_type < len(self.int_type_limits) and
+               len(dictionary) > self.int_type_limits[int_type]):
+            int_type += 1
+
+        write_binary_uint64(self.serialization_type | int_type, writer)
+        write_binary_uint64(len(dictionary), writer)
+        self.nested_column.write_data(dictionary, writer)
+        write_binary_uint64(len(indexes), writer)
+        self.int_types[int_type]().write_data(indexes, writer)
+
+    def _encode(self, items):
+        dictionary = []
+        index_by_value = {}
+
+        if self.dictionary_nullable:
+            # First element represents NULL.
+            dictionary.append(self.nested_column.null_value)
+
+        indexes = []
+        for x in items:
+            if x is None and self.dictionary_nullable:
+                indexes.append(0)
+                continue
+
+            index = index_by_value.get(x)
+            if index is None:
+                index = index_by_value[x] = len(dictionary)
+                dictionary.append(x)
+            indexes.append(index)
+
+        return dictionary, indexes
@@ -0,0 +1,64 @@
+import asyncio
+from collections.abc import Sequence
+
+from aioclickhouse.columns.base import Column
+
+
+class NullableData(Sequence):
+    """
+    Decoded values of Nullable column together with its null map.
+    Values are substituted with None only on access.
+    """
+    __slots__ = ('null_map', 'values')
+
+    def __init__(self, null_map, values):
+        self.null_map = null_map
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return NullableData(self.null_map[item], self.values[item])
+        return None if self.null_map[item] else self.values[item]
+
+    def __iter__(self):
+        for is_null, value in zip(self.null_map, self.values):
+            yield None if is_null else value
+
+
+class NullableColumn(Column):
+    def __init__(self, nested_column, **kwargs):
+        self.nested_column = nested_column
+        super(NullableColumn, self).__init__(**kwargs)
+        self.nullable = True
+
+    @property
+    def ch_type(self):
+        return 'Nullable({})'.format(self.nested_column.ch_type)
+
+    async def read_state_prefix(self, reader: asyncio.StreamReader):
+        await self.nested_column.read_state_prefix(reader)
+
+    def write_state_prefix(self, writer: asyncio.StreamWriter):
+        self.nested_column.write_state_prefix(writer)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        null_map = await reader.readexactly(n_items)
+        if self.memory_budget is not None:
+            null_map = self.memory_budget.hold_bytes(null_map)
+        values = await self.nested_column.read_data(n_items, reader)
+        return NullableData(null_map, values)
+
+    def write_data(self, items, writer: asyncio.StreamWriter):
+        if isinstance(items, NullableData):
+            writer.write(bytes(items.null_map))
+            self.nested_column.write_data(items.values, writer)
+            return
+
+        null_value = self.nested_column.null_value
+        writer.write(bytes(x is None for x in items))
+        self.nested_column.write_data(
+            [null_value if x is None else x for x in items], writer
+        )
@@ -0,0 +1,114 @@
+from aioclickhouse.columns.arraycolumn import ArrayColumn, TupleColumn
+from aioclickhouse.columns.datecolumn import (
+    DateColumn, Date32Column, DateTimeColumn, DateTime64Column
+)
+from aioclickhouse.columns.floatcolumn import Float32Column, Float64Column
+from aioclickhouse.columns.intcolumn import (
+    Int8Column, Int16Column, Int32Column, Int64Column,
+    UInt8Column, UInt16Column, UInt32Column, UInt64Column
+)
+from aioclickhouse.columns.lowcardinalitycolumn import LowCardinalityColumn
+from aioclickhouse.columns.nullablecolumn import NullableColumn
+from aioclickhouse.columns.stringcolumn import String, FixedString
+from aioclickhouse.exceptions import UnknownTypeError
+
+column_by_type = {c.ch_type: c for c in [
+    DateColumn, Date32Column,
+    Float32Column, Float64Column,
+    Int8Column, Int16Column, Int32Column, Int64Column,
+    UInt8Column, UInt16Column, UInt32Column, UInt64Column,
+    String,
+]}
+
+
+def split_nested_types(spec):
+    """
+    Splits comma-separated types of Tuple/Nested into list of (name, type).
+    Name is None for unnamed elements.
+    """
+    elements = []
+    depth = 0
+    quoted = False
+    start = 0
+    for i, char in enumerate(spec):
+        if char == "'":
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            elements.append(spec[start:i].strip())
+            start = i + 1
+    elements.append(spec[start:].strip())
+
+    result = []
+    for element in elements:
+        space, bracket = element.find(' '), element.find('(')
+        if space != -1 and (bracket == -1 or space < bracket):
+            name, element = element[:space], element[space + 1:].strip()
+            result.append((name, element))
+        else:
+            result.append((None, element))
+    return result
+
+
+def get_column_by_spec(spec, column_options=None):
+    column_options = column_options or {}
+
+    if spec.startswith('FixedString'):
+        length = int(spec[12:-1])
+        return FixedString(length, **column_options)
+
+    elif spec.startswith('DateTime64'):
+        params = [x.strip() for x in spec[11:-1].split(',')]
+        timezone = params[1].strip("'") if len(params) > 1 else None
+        return DateTime64Column(scale=int(params[0]), timezone=timezone,
+                                **column_options)
+
+    elif spec.startswith('DateTime'):
+        timezone = spec[10:-2] if spec.endswith(')') else None
+        return DateTimeColumn(timezone=timezone, **column_options)
+
+    elif spec.startswith('Array'):
+        nested = get_column_by_spec(spec[6:-1], column_options)
+        return ArrayColumn(nested, **column_options)
+
+    elif spec.startswith('Tuple') or spec.startswith('Nested'):
+        inner = spec[spec.index('(') + 1:-1]
+        elements = split_nested_types(inner)
+        names = [name for name, _ in elements]
+        columns = [
+            get_column_by_spec(element, column_options)
+            for _, element in elements
+        ]
+        column = TupleColumn(
+            columns, names=names if all(names) else None, **column_options
+        )
+        if spec.startswith('Nested'):
+            # Not flattened Nested is Array(Tuple(...)) on the wire.
+            column = ArrayColumn(column, **column_options)
+        return column
+
+    elif spec.startswith('Nullable'):
+        nested = get_column_by_spec(spec[9:-1], column_options)
+        return NullableColumn(nested, **column_options)
+
+    elif spec.startswith('LowCardinality'):
+        inner = spec[15:-1]
+        nullable = inner.startswith('Nullable')
+        if nullable:
+            inner = inner[9:-1]
+        nested = get_column_by_spec(inner, column_options)
+        return LowCardinalityColumn(nested, nullable=nullable,
+                                    **column_options)
+
+    else:
+        try:
+            cls = column_by_type[spec]
+            return cls(**column_options)
+
+        except KeyError:
+            raise UnknownTypeError('Unknown type {}'.format(spec))
@@ -0,0 +1,141 @@
+import asyncio
+from array import array
+from collections.abc import Sequence
+
+from aioclickhouse.columns.base import Column
+from aioclickhouse.reader import read_varint
+from aioclickhouse.writer import write_binary_bytes, write_binary_bytes_fixed_len
+
+# Memory taken by str object besides its characters plus list slot for it.
+STR_OVERHEAD = 49 + 8
+
+
+class StringData(Sequence):
+    """
+    Encoded strings in one buffer (usually spilled to disk) with end offset
+    of every string. Strings are decoded on access.
+    """
+    __slots__ = ('buffer', 'offsets', 'first_start')
+
+    def __init__(self, buffer, offsets, first_start=0):
+        self.buffer = buffer
+        self.offsets = offsets
+        self.first_start = first_start
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _start(self, i):
+        return self.offsets[i - 1] if i else self.first_start
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, _, step = item.indices(len(self.offsets))
+            if step != 1:
+                return [self[i] for i in range(len(self))[item]]
+            first_start = self._start(start) if start < len(self) else 0
+            return StringData(self.buffer, self.offsets[item], first_start)
+
+        if item < 0:
+            item += len(self.offsets)
+        if not 0 <= item < len(self.offsets):
+            raise IndexError('StringData index out of range')
+        return bytes(
+            self.buffer[self._start(item):self.offsets[item]]
+        ).decode()
+
+
+class FixedStringData(Sequence):
+    """
+    FixedString values in one buffer, decoded on access.
+    """
+    __slots__ = ('buffer', 'length')
+
+    def __init__(self, buffer, length):
+        self.buffer = buffer
+        self.length = length
+
+    def __len__(self):
+        return len(self.buffer) // self.length
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(len(self))[item]]
+            return FixedStringData(
+                self.buffer[start * self.length:stop * self.length],
+                self.length
+            )
+
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError('FixedStringData index out of range')
+        start = item * self.length
+        return bytes(
+            self.buffer[start:start + self.length]
+        ).rstrip(b'\x00').decode()
+
+
+class String(Column):
+    ch_type = 'String'
+    py_types = (str, )
+    null_value = ''
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        if self.memory_budget is not None:
+            return await self._read_accounted(n_items, reader)
+
+        items = [None] * n_items
+        for i in range(n_items):
+            length = await read_varint(reader)
+            items[i] = (await reader.readexactly(length)).decode()
+        return items
+
+    async def _read_accounted(self, n_items, reader: asyncio.StreamReader):
+        buffer = bytearray()
+        offsets = array('Q')
+        for _ in range(n_items):
+            length = await read_varint(reader)
+            buffer += await reader.readexactly(length)
+            offsets.append(len(buffer))
+
+        if self.memory_budget.reserve(len(buffer) + n_items * STR_OVERHEAD):
+            return list(StringData(buffer, offsets))
+
+        return StringData(
+            self.memory_budget.hold_bytes(buffer),
+            self.memory_budget.hold(offsets)
+        )
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        for item in items:
+            write_binary_bytes(item.encode(), writer)
+
+
+class FixedString(String):
+    ch_type = 'FixedString'
+
+    def __init__(self, length, **kwargs):
+        self.length = length
+        super(FixedString, self).__init__(**kwargs)
+
+    async def read_items(self, n_items, reader: asyncio.StreamReader):
+        data = await reader.readexactly(n_items * self.length)
+
+        if self.memory_budget is not None and not self.memory_budget.reserve(
+                len(data) + n_items * STR_OVERHEAD):
+            return FixedStringData(
+                self.memory_budget.hold_bytes(data), self.length
+            )
+
+        length = self.length
+        return [
+            data[i:i + length].rstrip(b'\x00').decode()
+            for i in range(0, len(data), length)
+        ]
+
+    def write_items(self, items, writer: asyncio.StreamWriter):
+        for item in items:
+            write_binary_bytes_fixed_len(item.encode(), writer, self.length)
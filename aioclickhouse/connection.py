@@ -1,12 +1,25 @@
 import logging
 import asyncio
 from collections import namedtuple
+from time import perf_counter
 
 from async_timeout import timeout
 
 from aioclickhouse.writer import write_varint, write_binary_str
+from aioclickhouse.rawio import open_raw_blocks
+from aioclickhouse.spill import MemoryBudget
 from aioclickhouse.reader import read_binary_str, read_varint, read_exception
-from aioclickhouse.exceptions import UnexpectedPacketFromServerError
+from aioclickhouse.exceptions import (
+    UnexpectedPacketFromServerError,
+    IncompatibleColumnsError,
+)
+from aioclickhouse.tracing import (
+    NoopTracer,
+    IOStats,
+    TracedStreamReader,
+    TracedStreamWriter,
+    trace_io,
+)
 from aioclickhouse.constants import (
     ClientPacketTypes,
     ServerPacketTypes,
@@ -14,6 +27,8 @@ from aioclickhouse.constants import (
     DBMS_VERSION_MINOR,
     CLIENT_VERSION,
     DBMS_MIN_REVISION_WITH_SERVER_TIMEZONE,
+    DBMS_MIN_REVISION_WITH_TEMPORARY_TABLES,
+    DBMS_MIN_REVISION_WITH_BLOCK_INFO,
 )
 
 
@@ -36,28 +51,60 @@ ServerInfo = namedtuple('ServerInfo', [
 
 class Connection:
     def __init__(
-        self, host="127.0.0.1", port=9000, *, database, user, password, loop=None
+        self, host="127.0.0.1", port=9000, *, database, user, password, loop=None,
+        tracer=None, max_client_memory=None, use_numpy=False
     ):
         self.host = host
         self.port = port
         self._writer: asyncio.StreamWriter = None
         self._reader: asyncio.StreamReader = None
         self._connected = False
-        self._loop: asyncio.BaseEventLoop = loop or asyncio.get_event_loop
+        self._loop: asyncio.BaseEventLoop = loop
         self.database = database
         self.user = user
         self.password = password
         self.client_name = 'aioclickhouse_python'
         self.server_info = None
+        self.tracer = tracer or NoopTracer()
+        self.io_stats = IOStats()
+        self.max_client_memory = max_client_memory
+        self.use_numpy = use_numpy
+
+    def trace(self, name, **attributes):
+        attributes.setdefault('net.peer.name', self.host)
+        attributes.setdefault('net.peer.port', self.port)
+        attributes.setdefault('db.name', self.database)
+        return trace_io(self.tracer, name, self.io_stats, attributes)
+
+    def make_column_options(self):
+        """
+        Options for columns decoding single query result.
+        """
+        options = {'use_numpy': self.use_numpy}
+        if self.server_info is not None and self.server_info.timezone:
+            options['server_timezone'] = self.server_info.timezone
+        if self.max_client_memory is not None:
+            options['memory_budget'] = MemoryBudget(self.max_client_memory)
+        return options
 
     async def connect(self):
-        self._reader, self._writer = await asyncio.open_connection(self.host, self.port, loop=self._loop)
-        self._connected = True
-        await self.send_hello()
-        await self.receive_hello()
+        with self.trace('clickhouse.connect'):
+            start = perf_counter()
+            reader, writer = await asyncio.open_connection(self.host, self.port)
+            # TCP handshake is network time too.
+            self.io_stats.network_wait += perf_counter() - start
+            self._reader = TracedStreamReader(reader, self.io_stats)
+            self._writer = TracedStreamWriter(writer, self.io_stats)
+            self._connected = True
+            await self.send_hello()
+            await self.receive_hello()
         logging.debug(f"{self} connected")
 
     async def send_hello(self):
+        with self.trace('clickhouse.send_hello'):
+            await self._send_hello()
+
+    async def _send_hello(self):
         write_varint(ClientPacketTypes.HELLO, self._writer)
         write_binary_str(self.client_name, self._writer)
         write_varint(DBMS_VERSION_MAJOR, self._writer)
@@ -70,6 +117,10 @@ class Connection:
         await self._writer.drain()
 
     async def receive_hello(self):
+        with self.trace('clickhouse.receive_hello'):
+            await self._receive_hello()
+
+    async def _receive_hello(self):
         packet_type = await read_varint(self._reader)
 
         if packet_type == ServerPacketTypes.HELLO:
@@ -94,6 +145,48 @@ class Connection:
                                                      packet_type)
             raise UnexpectedPacketFromServerError(message)
 
+    async def send_raw_data(self, block, external_table_name=''):
+        """
+        Sends already encoded block as DATA packet. external_table_name is
+        name of external (temporary) table the block belongs to, it must be
+        empty for INSERT data.
+        """
+        with self.trace('clickhouse.send_data', **{'clickhouse.raw': True}):
+            write_varint(ClientPacketTypes.DATA, self._writer)
+            revision = self.server_info.revision
+            if revision >= DBMS_MIN_REVISION_WITH_TEMPORARY_TABLES:
+                write_binary_str(external_table_name, self._writer)
+            self._writer.write(block)
+            await self._writer.drain()
+
+    async def import_raw(self, path, columns_with_types=None):
+        """
+        Sends blocks from file written by RawBlockWriter as INSERT data
+        without re-encoding. INSERT query must be already sent;
+        columns_with_types is its header block structure received from
+        server. File is memory-mapped, blocks are not copied into Python
+        objects.
+        """
+        with open_raw_blocks(path) as (header, blocks):
+            revision = self.server_info.revision
+            has_block_info = revision >= DBMS_MIN_REVISION_WITH_BLOCK_INFO
+            if has_block_info != (
+                    header.revision >= DBMS_MIN_REVISION_WITH_BLOCK_INFO):
+                raise IncompatibleColumnsError(
+                    'Raw blocks were written for server revision {}, '
+                    'incompatible with {}'.format(header.revision, revision)
+                )
+
+            if (columns_with_types is not None and
+                    list(columns_with_types) != header.columns_with_types):
+                raise IncompatibleColumnsError(
+                    'Raw blocks structure {} differs from table structure {}'
+                    .format(header.columns_with_types, columns_with_types)
+                )
+
+            for block in blocks:
+                await self.send_raw_data(block)
+
     def disconnect(self):
         self._writer.close()
 
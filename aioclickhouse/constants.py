@@ -20,11 +20,27 @@ DBMS_DEFAULT_TIMEOUT_SEC = 300
 
 DBMS_DEFAULT_SYNC_REQUEST_TIMEOUT_SEC = 5
 
+DEFAULT_TABLE_HEADER_TTL_SEC = 300
+
 DEFAULT_COMPRESS_BLOCK_SIZE = 1048576
 DEFAULT_INSERT_BLOCK_SIZE = 1048576
 
+# Adaptive insert block sizing bounds (encoded bytes per block)
+DEFAULT_INSERT_BLOCK_MIN_BYTES = 1048576
+DEFAULT_INSERT_BLOCK_MAX_BYTES = 268435456
+DEFAULT_INSERT_BLOCK_INITIAL_BYTES = 16777216
+
 CLIENT_VERSION = 54337
 
+# Kept outside of enums: non-int attributes of IntEnum become members.
+_client_types_str = [
+    'Hello', 'Query', 'Data', 'Cancel', 'Ping', 'TablesStatusRequest'
+]
+_server_types_str = [
+    'Hello', 'Data', 'Exception', 'Progress', 'Pong', 'EndOfStream',
+    'ProfileInfo', 'Totals', 'Extremes', 'TablesStatusResponse'
+]
+
 
 class ClientPacketTypes(IntEnum):
     """
@@ -50,13 +66,9 @@ class ClientPacketTypes(IntEnum):
     # Check status of tables on the server.
     TABLES_STATUS_REQUEST = 5
 
-    _types_str = [
-        'Hello', 'Query', 'Data', 'Cancel', 'Ping', 'TablesStatusRequest'
-    ]
-
     @classmethod
     def to_str(cls, packet):
-        return 'Unknown packet' if packet > 5 else cls._types_str[packet]
+        return 'Unknown packet' if packet > 5 else _client_types_str[packet]
 
 
 class ServerPacketTypes(IntEnum):
@@ -93,14 +105,9 @@ class ServerPacketTypes(IntEnum):
     # A response to TablesStatus request.
     TABLES_STATUS_RESPONSE = 9
 
-    _types_str = [
-        'Hello', 'Data', 'Exception', 'Progress', 'Pong', 'EndOfStream',
-        'ProfileInfo', 'Totals', 'Extremes', 'TablesStatusResponse'
-    ]
-
     @classmethod
     def to_str(cls, packet):
-        return 'Unknown packet' if packet > 9 else cls._types_str[packet]
+        return 'Unknown packet' if packet > 9 else _server_types_str[packet]
 
 
 class Compression(IntEnum):
@@ -436,3 +436,29 @@ class UnknownPacketFromServerError(Error):
 
 class CannotParseUuidError(Error):
     code = ErrorCodes.CANNOT_PARSE_UUID
+
+
+class CorruptedDataError(Error):
+    code = ErrorCodes.CORRUPTED_DATA
+
+
+class IncompatibleColumnsError(Error):
+    code = ErrorCodes.INCOMPATIBLE_COLUMNS
+
+
+class QueryCancelledError(Error):
+    code = ErrorCodes.QUERY_WAS_CANCELLED
+
+
+class PartialInsertError(Error):
+    """
+    Raised when block was inserted into some shards only. failed maps
+    number of every failed shard to its part of the block, errors maps it
+    to the exception raised by the shard, succeeded lists shards which
+    have the rows already.
+    """
+    def __init__(self, message, failed, errors, succeeded):
+        self.message = message
+        self.failed = failed
+        self.errors = errors
+        self.succeeded = succeeded
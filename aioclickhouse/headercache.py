@@ -0,0 +1,110 @@
+import asyncio
+import time
+from collections import namedtuple
+
+from aioclickhouse.columns.service import get_column_by_spec
+from aioclickhouse.constants import DEFAULT_TABLE_HEADER_TTL_SEC
+
+
+TableHeader = namedtuple('TableHeader', [
+    'columns_with_types',
+    'columns',
+])
+
+
+class TableHeaderCache:
+    """
+    Cache of INSERT header blocks keyed by (database, table, server revision)
+    and column options, meant to be shared by connections of one pool.
+
+    Header holds column names with types and column codecs compiled for
+    them, so data can be encoded and sent right after INSERT query instead
+    of waiting for empty header block from server. Entries expire after
+    ttl seconds; invalidate() drops them explicitly, e.g. after ALTER or
+    when server rejects data encoded with cached header. Concurrent misses
+    for the same key share one fetch; fetch running during invalidate()
+    doesn't store its result.
+
+    Codecs are only used for encoding, so per-result memory_budget is not
+    passed to them.
+    """
+    def __init__(self, ttl=DEFAULT_TABLE_HEADER_TTL_SEC, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._headers = {}
+        self._fetching = {}
+        # (database, table) to number of invalidations.
+        self._generations = {}
+        self._clears = 0
+
+    def _lookup(self, key):
+        entry = self._headers.get(key)
+        if entry is None:
+            return None
+
+        expires_at, header = entry
+        if self.clock() >= expires_at:
+            del self._headers[key]
+            return None
+        return header
+
+    async def get(self, database, table, revision, fetch, column_options=None):
+        """
+        Returns cached header or calls fetch() coroutine function, which must
+        return list of (name, type) pairs, and caches its result.
+        """
+        column_options = {
+            name: value for name, value in (column_options or {}).items()
+            if name != 'memory_budget'
+        }
+        options_key = tuple(sorted(column_options.items()))
+        key = (database, table, revision, options_key)
+        header = self._lookup(key)
+        if header is not None:
+            return header
+
+        fetching = self._fetching.get(key)
+        if fetching is not None:
+            return await asyncio.shield(fetching)
+
+        fetching = asyncio.ensure_future(
+            self._fetch(key, fetch, column_options)
+        )
+        self._fetching[key] = fetching
+        return await asyncio.shield(fetching)
+
+    def _generation(self, key):
+        return self._clears, self._generations.get(key[:2], 0)
+
+    async def _fetch(self, key, fetch, column_options):
+        generation = self._generation(key)
+        try:
+            columns_with_types = list(await fetch())
+            header = TableHeader(columns_with_types, [
+                get_column_by_spec(type_, column_options)
+                for _, type_ in columns_with_types
+            ])
+            if self._generation(key) == generation:
+                self._headers[key] = (self.clock() + self.ttl, header)
+            return header
+        finally:
+            if self._fetching.get(key) is asyncio.current_task():
+                del self._fetching[key]
+
+    def invalidate(self, database, table):
+        """
+        Drops cached headers of table for all server revisions. Headers
+        being fetched at the moment are not cached, later get() fetches
+        them again.
+        """
+        table_key = (database, table)
+        self._generations[table_key] = self._generations.get(table_key, 0) + 1
+        for key in [k for k in self._headers if k[:2] == table_key]:
+            del self._headers[key]
+        for key in [k for k in self._fetching if k[:2] == table_key]:
+            del self._fetching[key]
+
+    def clear(self):
+        self._clears += 1
+        self._headers.clear()
+        self._fetching.clear()
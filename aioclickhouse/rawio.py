@@ -0,0 +1,312 @@
+import asyncio
+import mmap
+from collections import namedtuple
+from contextlib import contextmanager
+from struct import Struct
+
+from aioclickhouse.columns.service import split_nested_types
+from aioclickhouse.constants import DBMS_MIN_REVISION_WITH_BLOCK_INFO
+from aioclickhouse.exceptions import CorruptedDataError, UnknownTypeError
+from aioclickhouse.reader import read_binary_str, read_varint
+from aioclickhouse.writer import write_binary_str, write_varint
+
+# File starts with magic and server revision (UInt64), followed by columns
+# structure: number of columns (varint) and name and type (binary str) of
+# every column. Blocks are stored plain, as found in not compressed stream.
+MAGIC = b'CHRAWBL2'
+FILE_HEADER = Struct('<Q')
+
+# Every block in raw file is prefixed with its length in bytes.
+BLOCK_LENGTH = Struct('<Q')
+
+UINT64 = Struct('<Q')
+
+RawFileHeader = namedtuple('RawFileHeader', [
+    'revision',
+    'columns_with_types',
+])
+
+fixed_size_by_type = {
+    'Int8': 1, 'UInt8': 1, 'Bool': 1, 'Enum8': 1,
+    'Int16': 2, 'UInt16': 2, 'Enum16': 2, 'Date': 2,
+    'Int32': 4, 'UInt32': 4, 'Float32': 4, 'Date32': 4, 'DateTime': 4,
+    'IPv4': 4, 'Decimal32': 4,
+    'Int64': 8, 'UInt64': 8, 'Float64': 8, 'DateTime64': 8, 'Decimal64': 8,
+    'Int128': 16, 'UInt128': 16, 'UUID': 16, 'IPv6': 16, 'Decimal128': 16,
+    'Int256': 32, 'UInt256': 32, 'Decimal256': 32,
+}
+
+index_sizes = {0: 1, 1: 2, 2: 4, 3: 8}
+
+
+class _RecordingReader:
+    """
+    Keeps every byte read from reader.
+    """
+    def __init__(self, reader):
+        self._reader = reader
+        self.data = bytearray()
+
+    async def read(self, n=-1):
+        data = await self._reader.read(n)
+        self.data += data
+        return data
+
+    async def readexactly(self, n):
+        data = await self._reader.readexactly(n)
+        self.data += data
+        return data
+
+
+def _type_name(spec):
+    bracket = spec.find('(')
+    return spec if bracket == -1 else spec[:bracket]
+
+
+def _type_args(spec):
+    return spec[spec.index('(') + 1:-1]
+
+
+def _fixed_size(spec):
+    name = _type_name(spec)
+    if name == 'FixedString':
+        return int(_type_args(spec))
+    elif name == 'Decimal':
+        precision = int(_type_args(spec).split(',')[0])
+        for limit, size in ((9, 4), (18, 8), (38, 16)):
+            if precision <= limit:
+                return size
+        return 32
+    return fixed_size_by_type.get(name)
+
+
+def _nested_specs(spec):
+    name = _type_name(spec)
+    if name in ('Array', 'Nullable', 'LowCardinality'):
+        return [_type_args(spec)]
+    elif name in ('Tuple', 'Map'):
+        return [t for _, t in split_nested_types(_type_args(spec))]
+    elif name == 'Nested':
+        return [
+            'Array(Tuple({}))'.format(', '.join(
+                t for _, t in split_nested_types(_type_args(spec))
+            ))
+        ]
+    return []
+
+
+async def _skip_prefix(spec, reader):
+    if _type_name(spec) == 'LowCardinality':
+        # Key serialization version.
+        await reader.readexactly(UINT64.size)
+        return
+
+    for nested in _nested_specs(spec):
+        await _skip_prefix(nested, reader)
+
+
+async def _skip_data(spec, n_items, reader):
+    """
+    Walks over serialized column data without decoding values.
+    """
+    if not n_items:
+        return
+
+    size = _fixed_size(spec)
+    if size is not None:
+        await reader.readexactly(n_items * size)
+        return
+
+    name = _type_name(spec)
+    if name == 'String':
+        for _ in range(n_items):
+            await reader.readexactly(await read_varint(reader))
+
+    elif name == 'Nullable':
+        await reader.readexactly(n_items)
+        await _skip_data(_type_args(spec), n_items, reader)
+
+    elif name in ('Array', 'Map', 'Nested'):
+        offsets = await reader.readexactly(n_items * UINT64.size)
+        n_values, = UINT64.unpack_from(offsets, len(offsets) - UINT64.size)
+        if name == 'Array':
+            nested = _type_args(spec)
+        else:
+            nested = 'Tuple({})'.format(_type_args(spec))
+        await _skip_data(nested, n_values, reader)
+
+    elif name == 'Tuple':
+        for nested in _nested_specs(spec):
+            await _skip_data(nested, n_items, reader)
+
+    elif name == 'LowCardinality':
+        nested = _type_args(spec)
+        if nested.startswith('Nullable'):
+            # Dictionary is stored without null map.
+            nested = _type_args(nested)
+        serialization_type, = UINT64.unpack(
+            await reader.readexactly(UINT64.size)
+        )
+        dictionary_size, = UINT64.unpack(
+            await reader.readexactly(UINT64.size)
+        )
+        await _skip_data(nested, dictionary_size, reader)
+        n_indexes, = UINT64.unpack(await reader.readexactly(UINT64.size))
+        await reader.readexactly(
+            n_indexes * index_sizes[serialization_type & 0xf]
+        )
+
+    else:
+        raise UnknownTypeError('Unknown type {}'.format(spec))
+
+
+async def read_raw_block(reader: asyncio.StreamReader, revision):
+    """
+    Reads one plain (not compressed) native block following DATA packet
+    header and returns its bytes as is together with columns structure.
+    Block is walked through to find its end, values are not decoded.
+    """
+    reader = _RecordingReader(reader)
+
+    if revision >= DBMS_MIN_REVISION_WITH_BLOCK_INFO:
+        while True:
+            field_num = await read_varint(reader)
+            if field_num == 0:
+                break
+            elif field_num == 1:
+                # is_overflows
+                await reader.readexactly(1)
+            elif field_num == 2:
+                # bucket_num
+                await reader.readexactly(4)
+            else:
+                raise CorruptedDataError(
+                    'Unknown block info field {}'.format(field_num)
+                )
+
+    n_columns = await read_varint(reader)
+    n_rows = await read_varint(reader)
+
+    columns_with_types = []
+    for _ in range(n_columns):
+        name = await read_binary_str(reader)
+        spec = await read_binary_str(reader)
+        columns_with_types.append((name, spec))
+        if n_rows:
+            await _skip_prefix(spec, reader)
+            await _skip_data(spec, n_rows, reader)
+
+    return bytes(reader.data), columns_with_types
+
+
+class RawBlockWriter:
+    """
+    Writes native blocks read by read_raw_block to file without decoding
+    them. Header stores everything needed to check that file can be
+    replayed: server revision and columns structure.
+    """
+    def __init__(self, path, revision, columns_with_types):
+        self.path = path
+        self.header = RawFileHeader(revision, columns_with_types)
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.path, 'wb')
+        self._file.write(MAGIC)
+        self._file.write(FILE_HEADER.pack(self.header.revision))
+        write_varint(len(self.header.columns_with_types), self._file)
+        for name, spec in self.header.columns_with_types:
+            write_binary_str(name, self._file)
+            write_binary_str(spec, self._file)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+        return False
+
+    def write_block(self, block):
+        self._file.write(BLOCK_LENGTH.pack(len(block)))
+        self._file.write(block)
+
+
+def _unpack(fmt, view, pos):
+    if pos + fmt.size > len(view):
+        raise CorruptedDataError('Raw blocks file is truncated')
+    return fmt.unpack_from(view, pos), pos + fmt.size
+
+
+def _read_varint(view, pos):
+    shift = result = 0
+    while True:
+        if pos >= len(view):
+            raise CorruptedDataError('Raw blocks file is truncated')
+        i = view[pos]
+        pos += 1
+        result |= (i & 0x7f) << shift
+        shift += 7
+        if not (i & 0x80):
+            return result, pos
+
+
+def _read_str(view, pos):
+    length, pos = _read_varint(view, pos)
+    if pos + length > len(view):
+        raise CorruptedDataError('Raw blocks file is truncated')
+    return bytes(view[pos:pos + length]).decode(), pos + length
+
+
+def _read_header(view):
+    if bytes(view[:len(MAGIC)]) != MAGIC:
+        raise CorruptedDataError('Not a raw blocks file')
+
+    (revision, ), pos = _unpack(FILE_HEADER, view, len(MAGIC))
+    n_columns, pos = _read_varint(view, pos)
+    columns_with_types = []
+    for _ in range(n_columns):
+        name, pos = _read_str(view, pos)
+        spec, pos = _read_str(view, pos)
+        columns_with_types.append((name, spec))
+
+    return RawFileHeader(revision, columns_with_types), pos
+
+
+@contextmanager
+def open_raw_blocks(path):
+    """
+    Memory-maps file written by RawBlockWriter and yields its header and
+    iterator of memoryviews over its blocks. Views must not outlive the
+    context.
+    """
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty file can't be mapped.
+            raise CorruptedDataError('Not a raw blocks file')
+
+        view = memoryview(mm)
+        blocks = None
+        try:
+            header, pos = _read_header(view)
+            blocks = _iter_blocks(view, pos)
+            yield header, blocks
+        finally:
+            if blocks is not None:
+                blocks.close()
+            view.release()
+            mm.close()
+
+
+def _iter_blocks(view, pos):
+    end = len(view)
+    while pos < end:
+        (length, ), pos = _unpack(BLOCK_LENGTH, view, pos)
+        if pos + length > end:
+            raise CorruptedDataError('Raw blocks file is truncated')
+
+        block = view[pos:pos + length]
+        try:
+            yield block
+        finally:
+            block.release()
+        pos += length
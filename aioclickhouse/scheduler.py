@@ -0,0 +1,202 @@
+import asyncio
+import logging
+from collections import deque, namedtuple
+
+
+SchedulingClass = namedtuple('SchedulingClass', [
+    'weight',
+    'limit',
+    'priority',
+    'preemptible',
+], defaults=[1, None, 0, False])
+
+
+class Slot:
+    """
+    Granted right to run one query. cancel is called (function or
+    coroutine function) when slot is preempted by higher priority work;
+    slot still must be released by its holder, it's given to the class
+    that preempted it then.
+    """
+    def __init__(self, scheduler, class_name, cancel=None):
+        self.scheduler = scheduler
+        self.class_name = class_name
+        self.cancel = cancel
+        self.preempted = False
+        self.preempted_for = None
+
+    def release(self):
+        self.scheduler.release(self)
+
+
+class _ClassState:
+    def __init__(self, spec):
+        self.spec = spec
+        self.waiters = deque()
+        self.running = 0
+        self.vtime = 0.0
+
+    @property
+    def has_capacity(self):
+        return self.spec.limit is None or self.running < self.spec.limit
+
+    def pop_waiter(self):
+        """
+        Returns first waiter not cancelled yet or None.
+        """
+        while self.waiters:
+            waiter, slot = self.waiters.popleft()
+            if not waiter.cancelled():
+                return waiter, slot
+        return None
+
+
+class _SlotContext:
+    def __init__(self, scheduler, class_name, cancel):
+        self.scheduler = scheduler
+        self.class_name = class_name
+        self.cancel = cancel
+        self.slot = None
+
+    async def __aenter__(self):
+        self.slot = await self.scheduler.acquire(self.class_name, self.cancel)
+        return self.slot
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.slot.release()
+        return False
+
+
+class PriorityScheduler:
+    """
+    Shares max_concurrency query slots (e.g. pool connections) between
+    scheduling classes.
+
+    Each class has its own concurrency limit. When slot frees up, it's given
+    to the waiting class with the least virtual time, which grows by
+    1 / weight per granted slot, so under contention classes get slots in
+    proportion to their weights. If all slots are busy, waiter of higher
+    priority preempts running slot of lower priority preemptible class by
+    calling its cancel and gets that slot once it's released.
+
+        scheduler = PriorityScheduler(10, {
+            'dashboard': SchedulingClass(weight=4, priority=1),
+            'export': SchedulingClass(weight=1, limit=4, preemptible=True),
+        })
+        async with scheduler.slot('export', cancel=connection.cancel):
+            ...
+    """
+    def __init__(self, max_concurrency, classes):
+        if max_concurrency <= 0:
+            raise ValueError('max_concurrency must be positive')
+
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self._vtime = 0.0
+        self._classes = {}
+        self._running_slots = []
+
+        for name, spec in classes.items():
+            if not isinstance(spec, SchedulingClass):
+                spec = SchedulingClass(**spec)
+            if spec.weight <= 0:
+                raise ValueError('Weight of class {} must be positive'
+                                 .format(name))
+            self._classes[name] = _ClassState(spec)
+
+    def slot(self, class_name, cancel=None):
+        return _SlotContext(self, class_name, cancel)
+
+    async def acquire(self, class_name, cancel=None):
+        state = self._classes[class_name]
+        slot = Slot(self, class_name, cancel)
+
+        if (self.running < self.max_concurrency and state.has_capacity and
+                not state.waiters):
+            self._grant(state, slot)
+            return slot
+
+        waiter = asyncio.get_event_loop().create_future()
+        state.waiters.append((waiter, slot))
+        self._preempt_for(state)
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Slot was granted right before cancellation.
+                self.release(slot)
+            elif (waiter, slot) in state.waiters:
+                state.waiters.remove((waiter, slot))
+            raise
+
+        return slot
+
+    def release(self, slot):
+        state = self._classes[slot.class_name]
+        state.running -= 1
+        self.running -= 1
+        self._running_slots.remove(slot)
+
+        # Freed slot is reserved for the waiter which preempted it.
+        beneficiary = slot.preempted_for
+        if beneficiary is not None and beneficiary.has_capacity:
+            self._grant_next(beneficiary)
+        self._dispatch()
+
+    def _grant(self, state, slot):
+        if not state.running:
+            # Idle class doesn't accumulate credit.
+            state.vtime = max(state.vtime, self._vtime)
+        self._vtime = state.vtime
+        state.vtime += 1.0 / state.spec.weight
+        state.running += 1
+        self.running += 1
+        self._running_slots.append(slot)
+
+    def _dispatch(self):
+        while self.running < self.max_concurrency:
+            candidates = [
+                s for s in self._classes.values()
+                if s.waiters and s.has_capacity
+            ]
+            if not candidates:
+                return
+
+            state = min(
+                candidates, key=lambda s: (s.vtime, -s.spec.priority)
+            )
+            self._grant_next(state)
+
+    def _grant_next(self, state):
+        item = state.pop_waiter()
+        if item is not None:
+            waiter, slot = item
+            self._grant(state, slot)
+            waiter.set_result(None)
+
+    def _preempt_for(self, state):
+        if self.running < self.max_concurrency or not state.has_capacity:
+            return
+
+        victims = [
+            slot for slot in self._running_slots
+            if not slot.preempted and slot.cancel is not None and
+            self._classes[slot.class_name].spec.preemptible and
+            self._classes[slot.class_name].spec.priority < state.spec.priority
+        ]
+        if not victims:
+            return
+
+        # Lowest priority, most recently started.
+        victim = min(
+            reversed(victims),
+            key=lambda s: self._classes[s.class_name].spec.priority
+        )
+        victim.preempted = True
+        victim.preempted_for = state
+        logging.debug(f"Preempting {victim.class_name} slot")
+
+        result = victim.cancel()
+        if asyncio.iscoroutine(result):
+            asyncio.ensure_future(result)
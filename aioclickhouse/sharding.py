@@ -0,0 +1,128 @@
+import asyncio
+from collections import namedtuple
+
+from aioclickhouse.exceptions import PartialInsertError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+Shard = namedtuple('Shard', [
+    'weight',
+    'send',
+])
+
+
+class ShardedInserter:
+    """
+    Routes INSERT blocks to shards on client side, the same way Distributed
+    table does: row goes to shard by sharding key modulo total weight.
+
+    Block is dict of column name to column values. sharding_key takes block
+    and returns sequence (or numpy array) of non-negative integer keys for
+    all its rows. Negative keys are rejected: ClickHouse doesn't take
+    floored modulo of them as Python does, so they would be routed to
+    other shards than Distributed table routes them to.
+    Each shard's send(table, block) coroutine inserts part of the block,
+    usually using connection acquired from shard's pool. Parts of a block
+    are sent to shards in parallel.
+    """
+    def __init__(self, shards, sharding_key):
+        if not shards:
+            raise ValueError('At least one shard is required')
+
+        self.shards = [
+            shard if isinstance(shard, Shard) else Shard(*shard)
+            for shard in shards
+        ]
+        self.sharding_key = sharding_key
+
+        # Slot (key modulo total weight) to shard number.
+        self.slots = []
+        for i, shard in enumerate(self.shards):
+            if shard.weight <= 0:
+                raise ValueError('Shard weight must be positive')
+            self.slots.extend([i] * shard.weight)
+
+    def split(self, block):
+        """
+        Splits block into {shard number: block part}. Empty parts are
+        omitted.
+        """
+        keys = self.sharding_key(block)
+        total_weight = len(self.slots)
+
+        if np is not None and isinstance(keys, np.ndarray):
+            if len(keys) and keys.min() < 0:
+                raise ValueError('Sharding key must not be negative')
+            slots = np.asarray(self.slots)[keys % total_weight]
+            rows_by_shard = {
+                i: np.flatnonzero(slots == i) for i in np.unique(slots)
+            }
+        else:
+            rows_by_shard = {}
+            slots = self.slots
+            for row, key in enumerate(keys):
+                if key < 0:
+                    raise ValueError('Sharding key must not be negative')
+                rows_by_shard.setdefault(
+                    slots[key % total_weight], []
+                ).append(row)
+
+        return {
+            int(i): {
+                name: self._take(values, rows)
+                for name, values in block.items()
+            }
+            for i, rows in rows_by_shard.items() if len(rows)
+        }
+
+    @staticmethod
+    def _take(values, rows):
+        if np is not None and isinstance(values, np.ndarray):
+            return values[rows]
+        return [values[i] for i in rows]
+
+    async def insert_parts(self, table, parts):
+        """
+        Sends {shard number: block part} to shards and returns number of
+        inserted rows. If some of the shards fail, PartialInsertError
+        carries parts to be retried with this method, the rest of the
+        parts are already inserted.
+        """
+        shards = list(parts)
+        results = await asyncio.gather(*[
+            self.shards[i].send(table, parts[i]) for i in shards
+        ], return_exceptions=True)
+
+        errors = {
+            i: result for i, result in zip(shards, results)
+            if isinstance(result, BaseException)
+        }
+        if errors:
+            raise PartialInsertError(
+                'Insert into shards {} failed'.format(sorted(errors)),
+                failed={i: parts[i] for i in errors},
+                errors=errors,
+                succeeded=[i for i in shards if i not in errors]
+            ) from next(iter(errors.values()))
+
+        return sum(
+            len(next(iter(part.values()), ())) for part in parts.values()
+        )
+
+    async def insert_block(self, table, block):
+        return await self.insert_parts(table, self.split(block))
+
+    async def insert(self, table, blocks):
+        """
+        Inserts blocks one by one and returns number of inserted rows.
+        Blocks before the one which raised PartialInsertError are inserted
+        into all shards, blocks after it are not sent.
+        """
+        rows = 0
+        for block in blocks:
+            rows += await self.insert_block(table, block)
+        return rows
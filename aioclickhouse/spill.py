@@ -0,0 +1,61 @@
+import mmap
+import tempfile
+from array import array
+
+
+class MemoryBudget:
+    """
+    Limits memory held by decoded column chunks of one result.
+
+    Every decoded chunk is accounted. Chunks are kept in memory while total
+    size stays under max_client_memory. Chunks past the limit are written
+    to anonymous temporary files and memory-mapped back, so they are paged
+    in by OS on access instead of staying resident.
+    """
+    def __init__(self, max_client_memory, tmp_dir=None):
+        self.max_client_memory = max_client_memory
+        self.tmp_dir = tmp_dir
+        self.used = 0
+        self.spilled = 0
+
+    def reserve(self, size):
+        """
+        Accounts size bytes kept in memory if they fit into the limit.
+        Returns False if they don't, caller must spill then.
+        """
+        if self.used + size > self.max_client_memory:
+            return False
+        self.used += size
+        return True
+
+    def hold(self, items: array):
+        """
+        Returns array.array chunk or equivalent read-only typed memoryview
+        over spilled data.
+        """
+        size = len(items) * items.itemsize
+        if not size or self.reserve(size):
+            return items
+
+        return self._spill(items).cast(items.typecode)
+
+    def hold_bytes(self, data):
+        """
+        Returns bytes (or other contiguous buffer) or read-only memoryview
+        over spilled copy of them.
+        """
+        size = memoryview(data).nbytes
+        if not size or self.reserve(size):
+            return data
+
+        return self._spill(data)
+
+    def _spill(self, data):
+        self.spilled += memoryview(data).nbytes
+        with tempfile.TemporaryFile(dir=self.tmp_dir) as f:
+            f.write(data)
+            f.flush()
+            # Mapping outlives file object and is freed with the last view.
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        return memoryview(mm)
@@ -0,0 +1,107 @@
+import asyncio
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class NoopSpan:
+    def set_attribute(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class NoopTracer:
+    """
+    Tracer that records nothing. Any object with OpenTelemetry-compatible
+    ``start_as_current_span(name, attributes=None)`` can be used instead.
+    """
+    def start_as_current_span(self, name, attributes=None):
+        return NoopSpan()
+
+
+class IOStats:
+    """
+    Byte counters and time spent awaiting the socket for one connection.
+    """
+    def __init__(self):
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.network_wait = 0.0
+
+    def snapshot(self):
+        return self.bytes_sent, self.bytes_received, self.network_wait
+
+
+class TracedStreamReader:
+    """
+    Wraps asyncio.StreamReader and accounts received bytes and time
+    blocked on the socket into IOStats.
+    """
+    def __init__(self, reader: asyncio.StreamReader, stats: IOStats):
+        self._reader = reader
+        self._stats = stats
+
+    async def read(self, n=-1):
+        start = perf_counter()
+        data = await self._reader.read(n)
+        self._stats.network_wait += perf_counter() - start
+        self._stats.bytes_received += len(data)
+        return data
+
+    async def readexactly(self, n):
+        start = perf_counter()
+        data = await self._reader.readexactly(n)
+        self._stats.network_wait += perf_counter() - start
+        self._stats.bytes_received += len(data)
+        return data
+
+
+class TracedStreamWriter:
+    """
+    Wraps asyncio.StreamWriter and accounts sent bytes and time spent in
+    drain into IOStats.
+    """
+    def __init__(self, writer: asyncio.StreamWriter, stats: IOStats):
+        self._writer = writer
+        self._stats = stats
+
+    def write(self, data):
+        # Typed memoryview's len() counts items, not bytes.
+        self._stats.bytes_sent += memoryview(data).nbytes
+        self._writer.write(data)
+
+    async def drain(self):
+        start = perf_counter()
+        await self._writer.drain()
+        self._stats.network_wait += perf_counter() - start
+
+    def close(self):
+        self._writer.close()
+
+
+@contextmanager
+def trace_io(tracer, name, stats: IOStats, attributes=None):
+    """
+    Opens span and reports bytes sent/received, time blocked on the socket
+    and the rest of the span time (client-side encoding/decoding).
+    """
+    with tracer.start_as_current_span(name, attributes=attributes) as span:
+        sent, received, wait = stats.snapshot()
+        start = perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed = perf_counter() - start
+            network_wait = stats.network_wait - wait
+            span.set_attribute('clickhouse.bytes_sent', stats.bytes_sent - sent)
+            span.set_attribute(
+                'clickhouse.bytes_received', stats.bytes_received - received
+            )
+            span.set_attribute('clickhouse.network_wait', network_wait)
+            span.set_attribute(
+                'clickhouse.client_time', max(elapsed - network_wait, 0.0)
+            )
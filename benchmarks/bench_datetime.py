@@ -0,0 +1,101 @@
+"""
+Decoding of DateTime/DateTime64/Date columns against per-value conversion.
+Run from repository root:
+
+    python -m benchmarks.bench_datetime
+"""
+import asyncio
+from array import array
+from datetime import date, datetime, timedelta
+from time import perf_counter
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from aioclickhouse.columns.service import get_column_by_spec
+
+N = 370000
+TZ = 'Europe/Moscow'
+START = 1600000000
+
+
+def reader_of(items):
+    reader = asyncio.StreamReader()
+    reader.feed_data(items.tobytes())
+    reader.feed_eof()
+    return reader
+
+
+def best_of(func, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        func()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def bench(name, spec, items, baseline, column_options=None):
+    column = get_column_by_spec(spec, column_options)
+
+    async def read():
+        return await column.read_data(len(items), reader_of(items))
+
+    def decode():
+        return asyncio.run(read())
+
+    if np is not None and column_options:
+        assert np.array_equal(decode(), baseline())
+    else:
+        assert decode() == baseline()
+    new, old = best_of(decode), best_of(baseline)
+    print('{:<36} per-value {:.3f}s  column {:.3f}s  x{:.2f}'.format(
+        name, old, new, old / new
+    ))
+
+
+def main():
+    tz = ZoneInfo(TZ)
+    spec = "DateTime('{}')".format(TZ)
+
+    unique = array('I', range(START, START + N * 60, 60))
+    bench('DateTime, unique', spec, unique,
+          lambda: [datetime.fromtimestamp(x, tz) for x in unique])
+
+    repeated = array('I', (START + i // 10 for i in range(N)))
+    bench('DateTime, 10 rows per second', spec, repeated,
+          lambda: [datetime.fromtimestamp(x, tz) for x in repeated])
+
+    ticks = array('q', (START * 1000 + i * 7 for i in range(N)))
+    bench('DateTime64(3), unique', "DateTime64(3, '{}')".format(TZ), ticks,
+          lambda: [
+              datetime.fromtimestamp(x // 1000, tz)
+              .replace(microsecond=x % 1000 * 1000) for x in ticks
+          ])
+
+    days = array('H', (18000 + i // 1000 for i in range(N)))
+    epoch = date(1970, 1, 1)
+    bench('Date, 1000 rows per day', 'Date', days,
+          lambda: [epoch + timedelta(days=x) for x in days])
+
+    if np is None:
+        return
+
+    numpy = {'use_numpy': True}
+    bench('DateTime, unique, numpy', spec, unique, lambda: np.array([
+        datetime.fromtimestamp(x, tz).replace(tzinfo=None) for x in unique
+    ], dtype='datetime64[s]'), numpy)
+
+    bench('DateTime64(3), unique, numpy', "DateTime64(3, '{}')".format(TZ),
+          ticks, lambda: np.array([
+              datetime.fromtimestamp(x // 1000, tz)
+              .replace(microsecond=x % 1000 * 1000, tzinfo=None)
+              for x in ticks
+          ], dtype='datetime64[ms]'), numpy)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+from array import array
+
+import pytest
+
+from aioclickhouse.columns.arraycolumn import FlatArrayData, TupleData
+from aioclickhouse.columns.service import get_column_by_spec
+from tests.util import decode, encode, roundtrip
+
+
+def as_lists(items):
+    return [
+        as_lists(x) if isinstance(x, (FlatArrayData, array, list)) else x
+        for x in items
+    ]
+
+
+def test_array():
+    items = [[1, 2], [], [3]]
+    decoded = roundtrip('Array(UInt8)', items)
+
+    assert isinstance(decoded, FlatArrayData)
+    assert decoded.offsets == array('Q', [2, 2, 3])
+    assert decoded.values == array('B', [1, 2, 3])
+    assert as_lists(decoded) == items
+    assert list(decoded[-1]) == [3]
+    assert list(decoded[-3]) == [1, 2]
+
+
+@pytest.mark.parametrize('index', [3, -4])
+def test_array_index_out_of_range(index):
+    decoded = roundtrip('Array(Int32)', [[1, 2], [3], [4, 5, 6]])
+    with pytest.raises(IndexError):
+        decoded[index]
+
+
+def test_array_wire_format():
+    assert encode('Array(UInt8)', [[1], [2, 3]]) == (
+        b'\x01' + b'\x00' * 7 + b'\x03' + b'\x00' * 7 + b'\x01\x02\x03'
+    )
+
+
+def test_nested_arrays():
+    items = [[['a'], ['b', 'c']], [], [['d'], []]]
+    decoded = roundtrip('Array(Array(String))', items)
+
+    assert as_lists(decoded) == items
+    assert list(decoded[0][1]) == ['b', 'c']
+
+
+def test_array_of_nullable_and_lowcardinality():
+    items = [['a', None], [], ['a']]
+    spec = 'Array(LowCardinality(Nullable(String)))'
+    assert [list(x) for x in roundtrip(spec, items)] == items
+
+    items = [[1, None], [None]]
+    assert [list(x) for x in roundtrip('Array(Nullable(Int8))', items)] == \
+        items
+
+
+def test_sliced_flat_array_reencoded():
+    items = [[1, 2], [3], [], [4, 5, 6]]
+    for spec in ('Array(UInt16)', 'Array(Array(UInt16))'):
+        if spec == 'Array(Array(UInt16))':
+            items = [[x] for x in items]
+
+        decoded = roundtrip(spec, items)
+        for start, stop in ((0, 2), (1, 3), (1, 4), (3, 4), (2, 2)):
+            sliced = decoded[start:stop]
+            assert as_lists(sliced) == items[start:stop]
+            assert encode(spec, sliced) == encode(spec, items[start:stop])
+
+
+def test_tuple():
+    items = [('a', 1, [1]), ('b', 2, [])]
+    spec = 'Tuple(String, UInt8, Array(Int32))'
+    decoded = roundtrip(spec, items)
+
+    assert isinstance(decoded, TupleData)
+    assert [(a, b, list(c)) for a, b, c in decoded] == \
+        [(a, b, c) for a, b, c in items]
+    assert encode(spec, decoded[1:]) == encode(spec, items[1:])
+
+
+def test_named_tuple():
+    spec = "Tuple(name String, at DateTime('UTC'))"
+    column = get_column_by_spec(spec)
+    assert column.names == ['name', 'at']
+
+    decoded = roundtrip(spec, [('a', 0)])
+    assert decoded.names == ['name', 'at']
+    assert decoded[0][0] == 'a'
+
+
+def test_nested():
+    spec = 'Nested(a String, b Int8)'
+    items = [[('x', 1)], [], [('y', 2), ('z', 3)]]
+    decoded = roundtrip(spec, items)
+
+    assert [list(x) for x in decoded] == items
+    # Not flattened Nested is Array(Tuple(...)) on the wire.
+    assert encode(spec, items) == encode('Array(Tuple(String, Int8))', items)
+
@@ -0,0 +1,182 @@
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from aioclickhouse.columns.service import get_column_by_spec
+from tests.util import decode, encode, roundtrip
+
+MOSCOW = ZoneInfo('Europe/Moscow')
+BERLIN = ZoneInfo('Europe/Berlin')
+
+
+def test_date():
+    items = [date(1970, 1, 1), date(2020, 1, 2), date(2020, 1, 2)]
+    assert roundtrip('Date', items) == items
+
+
+def test_date32():
+    items = [date(1960, 1, 1), date(2200, 12, 31)]
+    assert roundtrip('Date32', items) == items
+
+
+def test_datetime_in_column_timezone():
+    value = datetime(2020, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    decoded = roundtrip("DateTime('Europe/Moscow')", [value, 0])
+
+    assert decoded == [value, datetime(1970, 1, 1, tzinfo=timezone.utc)]
+    assert decoded[0].tzinfo is MOSCOW
+    assert decoded[0].hour == 6
+
+
+def test_datetime_falls_back_to_server_timezone():
+    options = {'server_timezone': 'Europe/Moscow'}
+    column = get_column_by_spec('DateTime', options)
+    assert column.timezone == 'Europe/Moscow'
+
+    # Naive datetime is treated as server time.
+    decoded = roundtrip('DateTime', [datetime(2020, 1, 2, 3, 4, 5)], options)
+    assert decoded == [datetime(2020, 1, 2, 3, 4, 5, tzinfo=MOSCOW)]
+
+
+def test_datetime_across_dst_transitions():
+    start = int(datetime(2020, 10, 24, tzinfo=timezone.utc).timestamp())
+    timestamps = list(range(start, start + 3 * 86400, 599))
+    decoded = roundtrip("DateTime('Europe/Berlin')", timestamps)
+
+    expected = [datetime.fromtimestamp(x, BERLIN) for x in timestamps]
+    assert [x.timestamp() for x in decoded] == timestamps
+    assert [(x.replace(tzinfo=None), x.utcoffset()) for x in decoded] == \
+        [(x.replace(tzinfo=None), x.utcoffset()) for x in expected]
+
+
+def test_datetime_repeated_values():
+    start = 1600000000
+    timestamps = [start + i // 10 for i in range(3000)]
+    decoded = roundtrip("DateTime('UTC')", timestamps)
+
+    assert [int(x.timestamp()) for x in decoded] == timestamps
+    # Equal timestamps share one object.
+    assert decoded[0] is decoded[9]
+
+
+def test_datetime64():
+    items = [
+        datetime(2020, 1, 2, 3, 4, 5, 123456, tzinfo=timezone.utc),
+        datetime(1960, 1, 2, 3, 4, 5, 999999, tzinfo=timezone.utc),
+        datetime(2299, 12, 31, 23, 59, 59, 999999, tzinfo=timezone.utc),
+    ]
+
+    assert roundtrip("DateTime64(6, 'Asia/Kolkata')", items) == items
+    assert roundtrip('DateTime64(3)', items) == [
+        x.replace(microsecond=x.microsecond // 1000 * 1000) for x in items
+    ]
+    assert roundtrip('DateTime64(0)', items) == [
+        x.replace(microsecond=0) for x in items
+    ]
+
+
+def test_datetime64_nanoseconds_truncated():
+    value = datetime(2020, 1, 2, tzinfo=timezone.utc)
+    ticks = int(value.timestamp()) * 10 ** 9 + 123456789
+    spec = "DateTime64(9, 'UTC')"
+    decoded = decode(spec, encode(spec, [ticks]), 1)
+    assert decoded == [value + timedelta(microseconds=123456)]
+
+
+def test_nullable_datetime():
+    value = datetime(2020, 1, 2, tzinfo=timezone.utc)
+    decoded = roundtrip("Nullable(DateTime('UTC'))", [value, None])
+    assert list(decoded) == [value, None]
+
+
+def to_wall_time(np, values):
+    return np.array([x.replace(tzinfo=None) for x in values],
+                    dtype='datetime64[us]')
+
+
+def test_numpy_dates():
+    np = pytest.importorskip('numpy')
+    items = [date(1970, 1, 1), date(2020, 1, 2), date(2149, 6, 6)]
+    for spec in ('Date', 'Date32'):
+        data = encode(spec, items)
+        decoded = decode(spec, data, 3, {'use_numpy': True})
+
+        assert decoded.dtype == np.dtype('datetime64[D]')
+        assert decoded.tolist() == items
+        assert encode(spec, decoded) == data
+
+
+def test_numpy_datetime_in_column_timezone():
+    np = pytest.importorskip('numpy')
+    start = int(datetime(2020, 3, 28, tzinfo=timezone.utc).timestamp())
+    # Clocks go forward on March 29.
+    timestamps = list(range(start, start + 3 * 86400, 599))
+    spec = "DateTime('Europe/Berlin')"
+    data = encode(spec, timestamps)
+
+    decoded = decode(spec, data, len(timestamps), {'use_numpy': True})
+    expected = decode(spec, data, len(timestamps))
+
+    assert decoded.dtype == np.dtype('datetime64[s]')
+    assert np.array_equal(decoded, to_wall_time(np, expected))
+    assert encode(spec, decoded) == data
+
+
+def test_numpy_datetime_when_clocks_go_back():
+    np = pytest.importorskip('numpy')
+    start = int(datetime(2020, 10, 24, tzinfo=timezone.utc).timestamp())
+    timestamps = list(range(start, start + 3 * 86400, 599))
+    spec = "DateTime('Europe/Berlin')"
+    data = encode(spec, timestamps)
+
+    decoded = decode(spec, data, len(timestamps), {'use_numpy': True})
+    expected = decode(spec, data, len(timestamps))
+    assert np.array_equal(decoded, to_wall_time(np, expected))
+
+
+def test_numpy_datetime_in_server_timezone():
+    pytest.importorskip('numpy')
+    value = int(datetime(2020, 1, 2, 3, tzinfo=timezone.utc).timestamp())
+    options = {'use_numpy': True, 'server_timezone': 'Europe/Moscow'}
+    decoded = decode('DateTime', encode('DateTime', [value]), 1, options)
+    assert decoded.tolist() == [datetime(2020, 1, 2, 6)]
+
+
+@pytest.mark.parametrize('scale', [0, 2, 3, 6, 9])
+def test_numpy_datetime64(scale):
+    np = pytest.importorskip('numpy')
+    spec = "DateTime64({}, 'America/New_York')".format(scale)
+    start = int(datetime(1960, 1, 1, tzinfo=timezone.utc).timestamp())
+    ticks = [
+        (start + i * 7919 * 3600) * 10 ** scale + i % 10 ** scale
+        for i in range(200)
+    ]
+    data = encode(spec, ticks)
+
+    decoded = decode(spec, data, len(ticks), {'use_numpy': True})
+    expected = decode(spec, data, len(ticks))
+
+    assert np.array_equal(
+        decoded.astype('datetime64[us]'), to_wall_time(np, expected)
+    )
+    assert encode(spec, decoded) == data
+
+
+def test_transition_table_matches_tzinfo():
+    np = pytest.importorskip('numpy')
+    from aioclickhouse.columns.datecolumn import TransitionTable
+
+    timestamps = np.arange(-2208988800, 4102444800, 86400 * 37 + 3671)
+    for name in ('Europe/Berlin', 'Asia/Kolkata', 'America/New_York',
+                 'Australia/Lord_Howe', 'UTC'):
+        tz = ZoneInfo(name)
+        offsets = TransitionTable(tz).utc_offsets(timestamps)
+        if offsets is None:
+            offsets = np.zeros_like(timestamps)
+
+        expected = [
+            datetime.fromtimestamp(int(x), tz).utcoffset().total_seconds()
+            for x in timestamps
+        ]
+        assert offsets.tolist() == expected
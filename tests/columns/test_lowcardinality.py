@@ -0,0 +1,52 @@
+from array import array
+
+from aioclickhouse.columns.lowcardinalitycolumn import LowCardinalityData
+from tests.util import decode, encode, roundtrip
+
+
+def test_lowcardinality_string():
+    items = ['a', 'b', 'a', 'a']
+    decoded = roundtrip('LowCardinality(String)', items)
+
+    assert isinstance(decoded, LowCardinalityData)
+    assert list(decoded) == items
+    assert list(decoded.dictionary) == ['a', 'b']
+    assert decoded.indexes == array('B', [0, 1, 0, 0])
+
+
+def test_lowcardinality_nullable():
+    items = ['a', None, 'b', None]
+    decoded = roundtrip('LowCardinality(Nullable(String))', items)
+
+    assert list(decoded) == items
+    assert decoded[1] is None
+    assert decoded.null_map == b'\x00\x01\x00\x01'
+
+
+def test_lowcardinality_wide_indexes():
+    items = [str(i) for i in range(300)]
+    decoded = roundtrip('LowCardinality(String)', items)
+
+    assert decoded.indexes.typecode == 'H'
+    assert decoded[299] == '299'
+
+
+def test_lowcardinality_int():
+    items = [5, 5, 7]
+    assert list(roundtrip('LowCardinality(UInt32)', items)) == items
+
+
+def test_lowcardinality_empty():
+    data = encode('LowCardinality(String)', [])
+    assert list(decode('LowCardinality(String)', data, 0)) == []
+
+
+def test_sliced_lowcardinality_reencoded():
+    spec = 'LowCardinality(Nullable(String))'
+    items = ['a', None, 'b', 'c']
+    decoded = roundtrip(spec, items)
+    sliced = decoded[1:3]
+
+    assert list(sliced) == [None, 'b']
+    # Dictionary is written as is, values decode the same.
+    assert list(decode(spec, encode(spec, sliced), 2)) == [None, 'b']
@@ -0,0 +1,31 @@
+from aioclickhouse.columns.nullablecolumn import NullableData
+from tests.util import encode, roundtrip
+
+
+def test_nullable_int():
+    items = [1, None, 3]
+    decoded = roundtrip('Nullable(Int32)', items)
+
+    assert isinstance(decoded, NullableData)
+    assert list(decoded) == items
+    assert decoded[1] is None
+    assert bytes(decoded.null_map) == b'\x00\x01\x00'
+
+
+def test_nullable_string():
+    items = [None, 'a', '']
+    assert list(roundtrip('Nullable(String)', items)) == items
+
+
+def test_nullable_wire_format():
+    # Null map first, then values with default in place of NULL.
+    assert encode('Nullable(UInt8)', [None, 5]) == b'\x01\x00\x00\x05'
+
+
+def test_sliced_nullable_reencoded():
+    items = [1, None, 3, None]
+    decoded = roundtrip('Nullable(Int32)', items)
+
+    assert list(decoded[1:3]) == [None, 3]
+    assert encode('Nullable(Int32)', decoded[1:3]) == \
+        encode('Nullable(Int32)', items[1:3])
@@ -0,0 +1,61 @@
+from array import array
+
+import pytest
+
+from aioclickhouse.columns.service import get_column_by_spec
+from aioclickhouse.exceptions import TypeMismatchError, UnknownTypeError
+from tests.util import BufferWriter, encode, roundtrip
+
+
+@pytest.mark.parametrize('spec, items', [
+    ('Int8', [-128, 0, 127]),
+    ('Int16', [-32768, 0, 32767]),
+    ('Int32', [-2 ** 31, 0, 2 ** 31 - 1]),
+    ('Int64', [-2 ** 63, 0, 2 ** 63 - 1]),
+    ('UInt8', [0, 255]),
+    ('UInt16', [0, 65535]),
+    ('UInt32', [0, 2 ** 32 - 1]),
+    ('UInt64', [0, 2 ** 64 - 1]),
+    ('Float32', [-1.5, 0.0, 2.25]),
+    ('Float64', [-1e300, 0.0, 1e-300]),
+])
+def test_numbers(spec, items):
+    decoded = roundtrip(spec, items)
+    assert isinstance(decoded, array)
+    assert list(decoded) == items
+
+
+def test_numbers_wire_format():
+    assert encode('UInt16', [1, 258]) == b'\x01\x00\x02\x01'
+    assert encode('Int8', [-1]) == b'\xff'
+
+
+def test_empty():
+    assert list(roundtrip('UInt32', [])) == []
+    assert roundtrip('String', []) == []
+
+
+def test_string():
+    items = ['', 'abc', 'юникод', 'x' * 300]
+    assert roundtrip('String', items) == items
+    assert encode('String', ['ab']) == b'\x02ab'
+
+
+def test_fixed_string():
+    items = ['', 'ab', 'abc']
+    assert roundtrip('FixedString(3)', items) == items
+    assert encode('FixedString(3)', ['ab']) == b'ab\x00'
+
+    with pytest.raises(ValueError):
+        encode('FixedString(2)', ['abc'])
+
+
+def test_types_check():
+    column = get_column_by_spec('UInt8', {'types_check': True})
+    with pytest.raises(TypeMismatchError):
+        column.write_data(['1'], BufferWriter())
+
+
+def test_unknown_type():
+    with pytest.raises(UnknownTypeError):
+        get_column_by_spec('Unknown')
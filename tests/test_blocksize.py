@@ -0,0 +1,96 @@
+import pytest
+
+from aioclickhouse.blocksize import AdaptiveBlockSize, estimate_row_size
+
+MB = 1 << 20
+
+
+def send(sizer, throughput):
+    """
+    Reports one block sent with throughput(block size) bytes per second.
+    """
+    n_bytes = sizer.target_bytes
+    sizer.update(n_bytes, n_bytes / throughput(n_bytes))
+    return sizer.target_bytes
+
+
+def test_grows_while_throughput_grows():
+    sizer = AdaptiveBlockSize(min_bytes=MB, max_bytes=64 * MB,
+                              initial_bytes=4 * MB)
+    # Fixed per-block overhead: bigger blocks are always faster.
+    sizes = [send(sizer, lambda n: n / (0.1 + n / 1e9)) for _ in range(20)]
+
+    assert sizes[0] > 4 * MB
+    assert sizes[:5] == sorted(sizes[:5])
+    assert max(sizes) == 64 * MB
+    assert all(MB <= x <= 64 * MB for x in sizes)
+    # Bound is the optimum, size settles there.
+    assert sizes[-10:] == [64 * MB] * 10
+
+
+def test_shrinks_while_throughput_grows_with_smaller_blocks():
+    sizer = AdaptiveBlockSize(min_bytes=MB, max_bytes=64 * MB,
+                              initial_bytes=32 * MB)
+    # Big blocks are penalized (e.g. memory pressure on server).
+    sizes = [send(sizer, lambda n: 1e9 / (1 + n / MB)) for _ in range(20)]
+
+    assert sizes[-1] < 32 * MB
+    assert min(sizes) == MB
+    assert sizes[-10:] == [MB] * 10
+    assert all(MB <= x <= 64 * MB for x in sizes)
+
+
+def test_settles_around_optimum():
+    sizer = AdaptiveBlockSize(min_bytes=MB, max_bytes=256 * MB,
+                              initial_bytes=MB)
+
+    def throughput(n):
+        # Peak at 16 MB.
+        return 1e9 / (1 + abs(n - 16 * MB) / (16 * MB))
+
+    sizes = [send(sizer, throughput) for _ in range(40)]
+    assert all(4 * MB <= x <= 64 * MB for x in sizes[-10:])
+
+
+def test_ignores_empty_measurements():
+    sizer = AdaptiveBlockSize(initial_bytes=4 * MB)
+    sizer.update(0, 1.0)
+    sizer.update(MB, 0.0)
+    assert sizer.target_bytes == 4 * MB
+
+
+def test_rows_for():
+    sizer = AdaptiveBlockSize(min_bytes=100, max_bytes=1000,
+                              initial_bytes=1000, min_rows=2, max_rows=50)
+    assert sizer.rows_for(100) == 10
+    assert sizer.rows_for(1000) == 2
+    assert sizer.rows_for(1) == 50
+
+
+def test_iter_blocks_by_bytes():
+    sizer = AdaptiveBlockSize(min_bytes=20, max_bytes=100, initial_bytes=20)
+    rows = [('abc', 1)] * 10  # 12 bytes each
+
+    assert [len(x) for x in sizer.iter_blocks(rows)] == [2] * 5
+
+
+def test_iter_blocks_honours_row_bounds():
+    sizer = AdaptiveBlockSize(min_bytes=10, max_bytes=100, initial_bytes=10,
+                              min_rows=3, max_rows=4)
+    rows = [('abc', 1)] * 10
+    assert [len(x) for x in sizer.iter_blocks(rows)] == [3, 3, 3, 1]
+
+    sizer = AdaptiveBlockSize(min_bytes=100, max_bytes=1000,
+                              initial_bytes=1000, max_rows=4)
+    assert [len(x) for x in sizer.iter_blocks(rows)] == [4, 4, 2]
+
+
+def test_estimate_row_size():
+    assert estimate_row_size(('ab', b'c', 1, [1, 2])) == 3 + 2 + 8 + 24
+
+
+def test_bounds_validation():
+    with pytest.raises(ValueError):
+        AdaptiveBlockSize(min_bytes=10, max_bytes=5)
+    with pytest.raises(ValueError):
+        AdaptiveBlockSize(min_rows=0)
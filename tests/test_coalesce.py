@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from aioclickhouse.coalesce import QueryCoalescer
+from aioclickhouse.exceptions import QueryCancelledError
+from tests.util import run
+
+
+class FakeQuery:
+    """
+    Counts executions, yields blocks once released.
+    """
+    def __init__(self, blocks, error=None):
+        self.blocks = blocks
+        self.error = error
+        self.executions = 0
+        self.cancelled = 0
+        self.release = None
+
+    async def __call__(self):
+        self.executions += 1
+        try:
+            await self.release.wait()
+            for block in self.blocks:
+                yield block
+            if self.error is not None:
+                raise self.error
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+
+
+async def collect(coalescer, key, query):
+    return [block async for block in coalescer.stream(key, query)]
+
+
+def test_identical_queries_share_execution():
+    async def main():
+        query = FakeQuery([1, 2, 3])
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer()
+        key = coalescer.make_key('SELECT 1')
+
+        tasks = [
+            asyncio.ensure_future(collect(coalescer, key, query))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        query.release.set()
+        results = await asyncio.gather(*tasks)
+
+        assert results == [[1, 2, 3]] * 3
+        assert query.executions == 1
+        assert coalescer.in_flight == 0
+
+    run(main())
+
+
+def test_error_is_delivered_to_every_waiter():
+    async def main():
+        query = FakeQuery([1], error=ValueError('boom'))
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer()
+        key = coalescer.make_key('SELECT 1')
+
+        tasks = [
+            asyncio.ensure_future(collect(coalescer, key, query))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        query.release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        assert all(isinstance(r, ValueError) for r in results)
+
+    run(main())
+
+
+def test_last_waiter_leaving_cancels_flight():
+    async def main():
+        query = FakeQuery([1])
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer()
+        key = coalescer.make_key('SELECT 1')
+
+        task = asyncio.ensure_future(collect(coalescer, key, query))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        assert query.cancelled == 1
+        assert coalescer.in_flight == 0
+
+    run(main())
+
+
+def test_waiter_joining_in_same_tick_as_cancel_gets_new_flight():
+    async def main():
+        query = FakeQuery([1, 2])
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer()
+        key = coalescer.make_key('SELECT 1')
+
+        first = asyncio.ensure_future(collect(coalescer, key, query))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        second = asyncio.ensure_future(collect(coalescer, key, query))
+        await asyncio.sleep(0.01)
+        query.release.set()
+
+        assert await asyncio.wait_for(second, 1) == [1, 2]
+        assert query.executions == 2
+        assert query.cancelled == 1
+
+    run(main())
+
+
+def test_attached_waiters_get_error_when_flight_is_cancelled():
+    async def main():
+        query = FakeQuery([1])
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer()
+        key = coalescer.make_key('SELECT 1')
+
+        task = asyncio.ensure_future(collect(coalescer, key, query))
+        await asyncio.sleep(0.01)
+        flight, = coalescer._flights.values()
+        flight.task.cancel()
+
+        with pytest.raises(QueryCancelledError):
+            await asyncio.wait_for(task, 1)
+
+    run(main())
+
+
+def test_bounded_queues_do_not_block_on_gone_waiter():
+    async def main():
+        query = FakeQuery(list(range(10)))
+        query.release = asyncio.Event()
+        coalescer = QueryCoalescer(max_buffered_blocks=1)
+        key = coalescer.make_key('SELECT 1')
+
+        async def take_one():
+            async for block in coalescer.stream(key, query):
+                return block
+
+        fast = asyncio.ensure_future(collect(coalescer, key, query))
+        slow = asyncio.ensure_future(take_one())
+        await asyncio.sleep(0)
+        query.release.set()
+
+        assert await asyncio.wait_for(slow, 1) == 0
+        assert await asyncio.wait_for(fast, 1) == list(range(10))
+
+    run(main())
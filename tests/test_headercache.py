@@ -0,0 +1,127 @@
+import asyncio
+
+from aioclickhouse.headercache import TableHeaderCache
+from aioclickhouse.spill import MemoryBudget
+from tests.util import run
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeDescribe:
+    def __init__(self, columns_with_types):
+        self.columns_with_types = columns_with_types
+        self.calls = 0
+        self.release = None
+
+    async def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        return self.columns_with_types
+
+
+def test_header_is_cached_until_ttl():
+    async def main():
+        clock = FakeClock()
+        cache = TableHeaderCache(ttl=10, clock=clock)
+        fetch = FakeDescribe([('id', 'UInt64'), ('s', 'String')])
+
+        header = await cache.get('db', 't', 54450, fetch)
+        assert header.columns_with_types == [('id', 'UInt64'), ('s', 'String')]
+        assert len(header.columns) == 2
+        assert await cache.get('db', 't', 54450, fetch) is header
+        assert fetch.calls == 1
+
+        clock.now = 10
+        assert await cache.get('db', 't', 54450, fetch) is not header
+        assert fetch.calls == 2
+
+    run(main())
+
+
+def test_concurrent_misses_share_fetch():
+    async def main():
+        cache = TableHeaderCache()
+        fetch = FakeDescribe([('id', 'UInt64')])
+        fetch.release = asyncio.Event()
+
+        tasks = [
+            asyncio.ensure_future(cache.get('db', 't', 54450, fetch))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+        fetch.release.set()
+        first, second, third = await asyncio.gather(*tasks)
+
+        assert first is second is third
+        assert fetch.calls == 1
+
+    run(main())
+
+
+def test_fetch_running_during_invalidate_is_not_cached():
+    async def main():
+        cache = TableHeaderCache()
+        old = FakeDescribe([('id', 'UInt64')])
+        old.release = asyncio.Event()
+
+        task = asyncio.ensure_future(cache.get('db', 't', 54450, old))
+        await asyncio.sleep(0.01)
+        assert old.calls == 1
+        cache.invalidate('db', 't')
+        old.release.set()
+        await task
+
+        new = FakeDescribe([('id', 'UInt64'), ('x', 'String')])
+        header = await cache.get('db', 't', 54450, new)
+        assert header.columns_with_types == [('id', 'UInt64'), ('x', 'String')]
+        assert new.calls == 1
+
+    run(main())
+
+
+def test_codecs_do_not_capture_memory_budget():
+    async def main():
+        cache = TableHeaderCache()
+        fetch = FakeDescribe([('s', 'String')])
+
+        header = await cache.get(
+            'db', 't', 54450, fetch,
+            column_options={'memory_budget': MemoryBudget(100)}
+        )
+        assert header.columns[0].memory_budget is None
+
+        other = await cache.get(
+            'db', 't', 54450, fetch,
+            column_options={'memory_budget': MemoryBudget(100)}
+        )
+        assert other is header
+        assert fetch.calls == 1
+
+    run(main())
+
+
+def test_headers_are_keyed_by_column_options():
+    async def main():
+        cache = TableHeaderCache()
+        fetch = FakeDescribe([('d', 'DateTime')])
+
+        utc = await cache.get(
+            'db', 't', 54450, fetch,
+            column_options={'server_timezone': 'UTC'}
+        )
+        moscow = await cache.get(
+            'db', 't', 54450, fetch,
+            column_options={'server_timezone': 'Europe/Moscow'}
+        )
+
+        assert utc is not moscow
+        assert fetch.calls == 2
+
+    run(main())
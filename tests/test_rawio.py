@@ -0,0 +1,143 @@
+import pytest
+
+from aioclickhouse.columns.service import get_column_by_spec
+from aioclickhouse.connection import Connection, ServerInfo
+from aioclickhouse.exceptions import (
+    CorruptedDataError, IncompatibleColumnsError
+)
+from aioclickhouse.rawio import (
+    RawBlockWriter, open_raw_blocks, read_raw_block
+)
+from aioclickhouse.writer import write_binary_str, write_varint
+from tests.util import BufferWriter, make_reader, run
+
+REVISION = 54337
+
+COLUMNS = [
+    ('id', 'UInt64'),
+    ('name', 'String'),
+    ('tag', 'LowCardinality(Nullable(String))'),
+    ('values', 'Array(Nullable(Int32))'),
+    ('pair', 'Tuple(FixedString(2), Decimal(10, 2))'),
+    ('attrs', 'Map(String, UInt8)'),
+]
+
+# Codecs producing the same wire format for types without own codec.
+ENCODE_AS = {
+    'Tuple(FixedString(2), Decimal(10, 2))': 'Tuple(FixedString(2), Int64)',
+    'Map(String, UInt8)': 'Array(Tuple(String, UInt8))',
+}
+
+DATA = [
+    [1, 2, 3],
+    ['a', '', 'ccc'],
+    ['x', None, 'x'],
+    [[1, None], [], [3]],
+    [('ab', 1), ('c', 2), ('', 3)],
+    [[('k', 1)], [], [('k', 2), ('l', 3)]],
+]
+
+
+def encode_block(columns, data, n_rows):
+    writer = BufferWriter()
+    # Block info: is_overflows, bucket_num, end of fields.
+    writer.write(b'\x01\x00\x02\xff\xff\xff\xff\x00')
+    write_varint(len(columns), writer)
+    write_varint(n_rows, writer)
+    for (name, spec), items in zip(columns, data):
+        write_binary_str(name, writer)
+        write_binary_str(spec, writer)
+        if n_rows:
+            column = get_column_by_spec(ENCODE_AS.get(spec, spec))
+            column.write_state_prefix(writer)
+            column.write_data(items, writer)
+    return bytes(writer.buffer)
+
+
+def test_read_raw_block_finds_block_end():
+    block = encode_block(COLUMNS, DATA, 3)
+
+    async def read():
+        reader = make_reader(block + b'next packet')
+        raw_block = await read_raw_block(reader, REVISION)
+        return raw_block, await reader.read()
+
+    (raw, columns_with_types), rest = run(read())
+
+    assert raw == block
+    assert columns_with_types == COLUMNS
+    assert rest == b'next packet'
+
+
+def test_write_and_read_file(tmp_path):
+    path = str(tmp_path / 'blocks.raw')
+    blocks = [encode_block(COLUMNS, DATA, 3), encode_block(COLUMNS, [], 0)]
+
+    with RawBlockWriter(path, REVISION, COLUMNS) as writer:
+        for block in blocks:
+            writer.write_block(block)
+
+    with open_raw_blocks(path) as (header, iter_blocks):
+        assert header.revision == REVISION
+        assert header.columns_with_types == COLUMNS
+        assert [bytes(x) for x in iter_blocks] == blocks
+
+
+def test_truncated_file(tmp_path):
+    path = str(tmp_path / 'blocks.raw')
+    with RawBlockWriter(path, REVISION, COLUMNS) as writer:
+        writer.write_block(encode_block(COLUMNS, DATA, 3))
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-1])
+
+    with pytest.raises(CorruptedDataError):
+        with open_raw_blocks(path) as (header, blocks):
+            list(blocks)
+
+
+def test_not_raw_file(tmp_path):
+    path = str(tmp_path / 'blocks.raw')
+    with open(path, 'wb') as f:
+        f.write(b'garbage')
+
+    with pytest.raises(CorruptedDataError):
+        with open_raw_blocks(path):
+            pass
+
+
+def make_connection(revision):
+    connection = Connection(database='default', user='default', password='')
+    connection.server_info = ServerInfo('ClickHouse', 1, 1, revision, 'UTC')
+    connection._writer = BufferWriter()
+    return connection
+
+
+def test_import_raw_sends_data_packets(tmp_path):
+    path = str(tmp_path / 'blocks.raw')
+    block = encode_block(COLUMNS, DATA, 3)
+    with RawBlockWriter(path, REVISION, COLUMNS) as writer:
+        writer.write_block(block)
+        writer.write_block(block)
+
+    connection = make_connection(REVISION)
+    run(connection.import_raw(path, COLUMNS))
+
+    # DATA packet type and empty external table name before every block.
+    packet = b'\x02\x00' + block
+    assert bytes(connection._writer.buffer) == packet * 2
+
+
+def test_import_raw_checks_compatibility(tmp_path):
+    path = str(tmp_path / 'blocks.raw')
+    with RawBlockWriter(path, REVISION, COLUMNS) as writer:
+        writer.write_block(encode_block(COLUMNS, DATA, 3))
+
+    with pytest.raises(IncompatibleColumnsError):
+        run(make_connection(REVISION).import_raw(path, COLUMNS[:1]))
+
+    # Server without block info in native blocks.
+    with pytest.raises(IncompatibleColumnsError):
+        run(make_connection(51000).import_raw(path, COLUMNS))
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from aioclickhouse.scheduler import PriorityScheduler, SchedulingClass
+from tests.util import run
+
+
+def test_class_limit_is_respected():
+    async def main():
+        scheduler = PriorityScheduler(4, {
+            'export': SchedulingClass(limit=1),
+        })
+        first = await scheduler.acquire('export')
+        second = asyncio.ensure_future(scheduler.acquire('export'))
+        await asyncio.sleep(0)
+        assert not second.done()
+
+        first.release()
+        await asyncio.sleep(0)
+        assert second.done()
+        assert scheduler.running == 1
+
+    run(main())
+
+
+def test_slots_are_shared_by_weight():
+    async def main():
+        scheduler = PriorityScheduler(1, {
+            'dashboard': SchedulingClass(weight=3),
+            'export': SchedulingClass(weight=1),
+        })
+        order = []
+
+        async def query(class_name):
+            async with scheduler.slot(class_name):
+                order.append(class_name)
+                await asyncio.sleep(0)
+
+        holder = await scheduler.acquire('export')
+        tasks = [
+            asyncio.ensure_future(query(class_name))
+            for class_name in ['dashboard', 'export'] * 8
+        ]
+        await asyncio.sleep(0)
+        holder.release()
+        await asyncio.gather(*tasks)
+
+        # Holder's slot is counted too.
+        granted = ['export'] + order[:7]
+        assert granted.count('dashboard') == 6
+        assert granted.count('export') == 2
+        assert scheduler.running == 0
+
+    run(main())
+
+
+def test_higher_priority_preempts_preemptible_slot():
+    async def main():
+        scheduler = PriorityScheduler(1, {
+            'dashboard': SchedulingClass(priority=1),
+            'export': SchedulingClass(preemptible=True),
+        })
+        cancelled = asyncio.Event()
+
+        async def cancel():
+            cancelled.set()
+
+        export = await scheduler.acquire('export', cancel=cancel)
+        dashboard = asyncio.ensure_future(scheduler.acquire('dashboard'))
+        await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert export.preempted
+        assert not dashboard.done()
+
+        export.release()
+        slot = await asyncio.wait_for(dashboard, 1)
+        assert slot.class_name == 'dashboard'
+
+    run(main())
+
+
+def test_preempted_slot_goes_to_waiter_that_preempted_it():
+    async def main():
+        scheduler = PriorityScheduler(1, {
+            'dashboard': SchedulingClass(weight=1, priority=1),
+            'export': SchedulingClass(weight=2, preemptible=True),
+        })
+        for _ in range(3):
+            (await scheduler.acquire('dashboard')).release()
+
+        cancelled = []
+        export = await scheduler.acquire(
+            'export', cancel=lambda: cancelled.append(1)
+        )
+        next_export = asyncio.ensure_future(scheduler.acquire('export'))
+        await asyncio.sleep(0)
+        dashboard = asyncio.ensure_future(scheduler.acquire('dashboard'))
+        await asyncio.sleep(0)
+        assert cancelled == [1]
+
+        # Export has less virtual time, but the slot was freed for dashboard.
+        export.release()
+        await asyncio.sleep(0)
+        assert dashboard.done()
+        assert not next_export.done()
+
+        dashboard.result().release()
+        await asyncio.wait_for(next_export, 1)
+
+    run(main())
+
+
+def test_waiter_cancelled_in_the_same_tick_as_release():
+    async def main():
+        scheduler = PriorityScheduler(1, {'default': SchedulingClass()})
+        holder = await scheduler.acquire('default')
+        cancelled = asyncio.ensure_future(scheduler.acquire('default'))
+        waiting = asyncio.ensure_future(scheduler.acquire('default'))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        holder.release()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+        slot = await asyncio.wait_for(waiting, 1)
+        assert scheduler.running == 1
+        slot.release()
+
+    run(main())
+
+
+def test_non_preemptible_slot_is_not_cancelled():
+    async def main():
+        scheduler = PriorityScheduler(1, {
+            'dashboard': SchedulingClass(priority=1),
+            'export': SchedulingClass(),
+        })
+        calls = []
+        export = await scheduler.acquire(
+            'export', cancel=lambda: calls.append(1)
+        )
+        dashboard = asyncio.ensure_future(scheduler.acquire('dashboard'))
+        await asyncio.sleep(0)
+
+        assert calls == []
+        assert not export.preempted
+        export.release()
+        await asyncio.wait_for(dashboard, 1)
+
+    run(main())
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def main():
+        scheduler = PriorityScheduler(1, {'default': SchedulingClass()})
+        holder = await scheduler.acquire('default')
+        cancelled = asyncio.ensure_future(scheduler.acquire('default'))
+        waiting = asyncio.ensure_future(scheduler.acquire('default'))
+        await asyncio.sleep(0)
+
+        cancelled.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+
+        holder.release()
+        slot = await asyncio.wait_for(waiting, 1)
+        assert scheduler.running == 1
+        slot.release()
+        assert scheduler.running == 0
+
+    run(main())
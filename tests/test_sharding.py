@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from aioclickhouse.exceptions import PartialInsertError
+from aioclickhouse.sharding import ShardedInserter
+from tests.util import run
+
+
+class FakeShard:
+    def __init__(self, fail_times=0):
+        self.fail_times = fail_times
+        self.rows = []
+
+    async def send(self, table, block):
+        await asyncio.sleep(0)
+        if self.fail_times:
+            self.fail_times -= 1
+            raise ConnectionError('shard is down')
+        self.rows.extend(block['id'])
+
+
+def make_inserter(*shards, weights=None):
+    weights = weights or [1] * len(shards)
+    return ShardedInserter(
+        [(w, shard.send) for w, shard in zip(weights, shards)],
+        lambda block: block['id']
+    )
+
+
+def test_split_by_key_and_weight():
+    inserter = make_inserter(FakeShard(), FakeShard(), weights=[1, 2])
+    parts = inserter.split({'id': list(range(6)), 'x': list('abcdef')})
+
+    assert parts == {
+        0: {'id': [0, 3], 'x': ['a', 'd']},
+        1: {'id': [1, 2, 4, 5], 'x': ['b', 'c', 'e', 'f']},
+    }
+
+
+def test_insert_counts_rows():
+    first, second = FakeShard(), FakeShard()
+    inserter = make_inserter(first, second)
+    blocks = [{'id': [0, 1, 2]}, {'id': [3, 4]}]
+
+    assert run(inserter.insert('t', blocks)) == 5
+    assert first.rows == [0, 2, 4]
+    assert second.rows == [1, 3]
+
+
+def test_partial_failure_reports_failed_parts_only():
+    first, second, third = FakeShard(), FakeShard(fail_times=1), FakeShard()
+    inserter = make_inserter(first, second, third)
+
+    with pytest.raises(PartialInsertError) as e:
+        run(inserter.insert_block('t', {'id': list(range(6))}))
+
+    assert e.value.failed == {1: {'id': [1, 4]}}
+    assert isinstance(e.value.errors[1], ConnectionError)
+    assert sorted(e.value.succeeded) == [0, 2]
+    assert first.rows == [0, 3]
+    assert third.rows == [2, 5]
+
+    # Retrying failed parts doesn't duplicate rows on other shards.
+    assert run(inserter.insert_parts('t', e.value.failed)) == 2
+    assert first.rows == [0, 3]
+    assert second.rows == [1, 4]
+    assert third.rows == [2, 5]
+
+
+def test_negative_keys_are_rejected():
+    inserter = make_inserter(FakeShard(), FakeShard())
+    with pytest.raises(ValueError):
+        inserter.split({'id': [1, -1]})
+
+
+def test_numpy_keys():
+    np = pytest.importorskip('numpy')
+    inserter = make_inserter(FakeShard(), FakeShard(), weights=[1, 2])
+    parts = inserter.split({'id': np.arange(6), 'x': list('abcdef')})
+
+    assert parts[0]['id'].tolist() == [0, 3]
+    assert parts[1]['x'] == ['b', 'c', 'e', 'f']
+
+    with pytest.raises(ValueError):
+        inserter.split({'id': np.array([1, -1])})
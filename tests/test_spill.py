@@ -0,0 +1,147 @@
+from array import array
+from datetime import date
+
+import pytest
+
+from aioclickhouse.columns.base import ConvertedData
+from aioclickhouse.columns.stringcolumn import FixedStringData, StringData
+from aioclickhouse.spill import MemoryBudget
+from tests.util import decode, encode, roundtrip
+
+
+def test_array_under_limit_stays_in_memory():
+    budget = MemoryBudget(1000)
+    items = budget.hold(array('q', range(10)))
+
+    assert isinstance(items, array)
+    assert budget.used == 80
+    assert budget.spilled == 0
+
+
+def test_array_over_limit_is_spilled():
+    budget = MemoryBudget(100)
+    budget.hold(array('q', range(10)))
+    items = budget.hold(array('q', range(10)))
+
+    assert isinstance(items, memoryview)
+    assert items.format == 'q'
+    assert list(items) == list(range(10))
+    assert budget.used == 80
+    assert budget.spilled == 80
+
+
+def test_int_column_spilled():
+    budget = MemoryBudget(0)
+    decoded = roundtrip('Int64', list(range(-5, 5)),
+                        {'memory_budget': budget})
+
+    assert isinstance(decoded, memoryview)
+    assert list(decoded) == list(range(-5, 5))
+    assert budget.spilled == 80
+
+
+def test_strings_are_accounted():
+    budget = MemoryBudget(10 ** 6)
+    decoded = roundtrip('String', ['abc', ''], {'memory_budget': budget})
+
+    assert decoded == ['abc', '']
+    assert budget.used > 3
+
+
+def test_strings_spilled():
+    budget = MemoryBudget(0)
+    items = ['abc', '', 'юникод'] * 10
+    decoded = roundtrip('String', items, {'memory_budget': budget})
+
+    assert isinstance(decoded, StringData)
+    assert isinstance(decoded.buffer, memoryview)
+    assert list(decoded) == items
+    assert list(decoded[1:4]) == items[1:4]
+    assert decoded[-1] == 'юникод'
+    assert budget.used == 0
+    with pytest.raises(IndexError):
+        decoded[len(items)]
+    with pytest.raises(IndexError):
+        decoded[-len(items) - 1]
+
+
+def test_fixed_strings_spilled():
+    budget = MemoryBudget(0)
+    items = ['ab', 'c', ''] * 10
+    decoded = roundtrip('FixedString(2)', items, {'memory_budget': budget})
+
+    assert isinstance(decoded, FixedStringData)
+    assert list(decoded) == items
+    assert list(decoded[2:5]) == items[2:5]
+
+
+def test_nullable_null_map_spilled():
+    budget = MemoryBudget(0)
+    items = [1, None, 3]
+    decoded = roundtrip('Nullable(Int32)', items, {'memory_budget': budget})
+
+    assert isinstance(decoded.null_map, memoryview)
+    assert list(decoded) == items
+
+
+def test_dates_stay_spilled():
+    budget = MemoryBudget(0)
+    items = [date(2020, 1, 1), date(2020, 1, 2)] * 10
+    decoded = roundtrip('Date', items, {'memory_budget': budget})
+
+    # Values are converted on access, raw data stays memory-mapped.
+    assert isinstance(decoded, ConvertedData)
+    assert isinstance(decoded.raw, memoryview)
+    assert list(decoded) == items
+    assert decoded[1] == date(2020, 1, 2)
+    assert list(decoded[1:3]) == items[1:3]
+
+
+def test_lowcardinality_nullable_spilled():
+    budget = MemoryBudget(0)
+    items = ['a', None, 'b'] * 10
+    decoded = roundtrip('LowCardinality(Nullable(String))', items,
+                        {'memory_budget': budget})
+
+    assert isinstance(decoded.dictionary, StringData)
+    assert isinstance(decoded.indexes, memoryview)
+    assert list(decoded) == items
+
+
+@pytest.mark.parametrize('spec, n_bytes', [
+    ('Date', 20 * 2 + 20 * 8),
+    ("DateTime('UTC')", 20 * 4 + 20 * 8),
+    ("DateTime64(2, 'UTC')", 20 * 8 + 20 * 8),
+])
+def test_numpy_datetimes_are_accounted(spec, n_bytes):
+    np = pytest.importorskip('numpy')
+    data = encode(spec, [0, 1] * 10)
+
+    budget = MemoryBudget(10 ** 6)
+    decoded = decode(spec, data, 20, {'use_numpy': True,
+                                      'memory_budget': budget})
+    assert budget.used == n_bytes
+    assert budget.spilled == 0
+
+    budget = MemoryBudget(0)
+    spilled = decode(spec, data, 20, {'use_numpy': True,
+                                      'memory_budget': budget})
+    assert budget.used == 0
+    assert budget.spilled == n_bytes
+    assert not spilled.flags.writeable
+    assert np.array_equal(spilled, decoded)
+    assert encode(spec, spilled) == data
+
+
+def test_numpy_datetime64_is_a_view_of_spilled_ticks():
+    pytest.importorskip('numpy')
+    spec = "DateTime64(3, 'UTC')"
+    data = encode(spec, list(range(20)))
+
+    budget = MemoryBudget(0)
+    decoded = decode(spec, data, 20, {'use_numpy': True,
+                                      'memory_budget': budget})
+    assert budget.spilled == 20 * 8
+    assert not decoded.flags.owndata
+    assert decoded.dtype.str == '<M8[ms]'
+    assert encode(spec, decoded) == data
@@ -0,0 +1,131 @@
+import asyncio
+from array import array
+
+from aioclickhouse.tracing import (
+    IOStats, TracedStreamReader, TracedStreamWriter, trace_io
+)
+from tests.util import BufferWriter
+
+
+class RecordingSpan:
+    def __init__(self):
+        self.attributes = {}
+
+    def set_attribute(self, key, value):
+        self.attributes[key] = value
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class RecordingTracer:
+    def __init__(self):
+        self.spans = []
+
+    def start_as_current_span(self, name, attributes=None):
+        span = RecordingSpan()
+        self.spans.append((name, span))
+        return span
+
+
+def test_written_bytes_of_typed_memoryview():
+    stats = IOStats()
+    buffer = BufferWriter()
+    writer = TracedStreamWriter(buffer, stats)
+
+    writer.write(memoryview(array('q', range(10))).cast('B'))
+    writer.write(memoryview(array('q', range(10))))
+    writer.write(b'abc')
+
+    assert stats.bytes_sent == 80 + 80 + 3
+
+
+def test_span_reports_io():
+    async def run():
+        stats = IOStats()
+        reader = asyncio.StreamReader()
+        reader.feed_data(b'abcdef')
+        reader.feed_eof()
+        reader = TracedStreamReader(reader, stats)
+        writer = TracedStreamWriter(BufferWriter(), stats)
+        tracer = RecordingTracer()
+
+        with trace_io(tracer, 'io', stats):
+            await reader.readexactly(4)
+            writer.write(b'xy')
+            await writer.drain()
+
+        return tracer.spans
+
+    (name, span), = asyncio.run(run())
+    assert name == 'io'
+    assert span.attributes['clickhouse.bytes_received'] == 4
+    assert span.attributes['clickhouse.bytes_sent'] == 2
+    assert span.attributes['clickhouse.network_wait'] >= 0
+    assert span.attributes['clickhouse.client_time'] >= 0
+
+
+def test_connect_spans():
+    from aioclickhouse.connection import Connection
+    from aioclickhouse.constants import ServerPacketTypes
+    from aioclickhouse.reader import read_binary_str, read_varint
+    from aioclickhouse.writer import write_binary_str, write_varint
+
+    server_hello = BufferWriter()
+    write_varint(ServerPacketTypes.HELLO, server_hello)
+    write_binary_str('ClickHouse', server_hello)
+    write_varint(21, server_hello)
+    write_varint(8, server_hello)
+    write_varint(54450, server_hello)
+    write_binary_str('UTC', server_hello)
+
+    async def handle(reader, writer):
+        # Client hello: packet type, name, version, database, credentials.
+        await read_varint(reader)
+        await read_binary_str(reader)
+        for _ in range(3):
+            await read_varint(reader)
+        for _ in range(3):
+            await read_binary_str(reader)
+        writer.write(server_hello.buffer)
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        tracer = RecordingTracer()
+        connection = Connection(
+            '127.0.0.1', port, database='db', user='default', password='',
+            tracer=tracer
+        )
+        async with server:
+            await connection.connect()
+            connection.disconnect()
+        return connection, tracer.spans
+
+    connection, spans = asyncio.run(run())
+    spans = dict(spans)
+    assert list(spans) == [
+        'clickhouse.connect',
+        'clickhouse.send_hello',
+        'clickhouse.receive_hello',
+    ]
+    assert connection.server_info.revision == 54450
+    assert connection.server_info.timezone == 'UTC'
+
+    sent = spans['clickhouse.send_hello'].attributes
+    received = spans['clickhouse.receive_hello'].attributes
+    connect = spans['clickhouse.connect'].attributes
+    assert sent['clickhouse.bytes_sent'] == connection.io_stats.bytes_sent > 0
+    assert sent['clickhouse.bytes_received'] == 0
+    assert received['clickhouse.bytes_sent'] == 0
+    assert received['clickhouse.bytes_received'] == len(server_hello.buffer)
+    assert connect['clickhouse.bytes_sent'] == sent['clickhouse.bytes_sent']
+    assert connect['clickhouse.bytes_received'] == len(server_hello.buffer)
+    assert connect['clickhouse.network_wait'] > (
+        sent['clickhouse.network_wait'] + received['clickhouse.network_wait']
+    )
@@ -0,0 +1,67 @@
+import asyncio
+
+
+class BufferWriter:
+    """
+    Minimal stand-in for asyncio.StreamWriter collecting written bytes.
+    """
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def write(self, data):
+        self.buffer += memoryview(data).cast('B')
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def make_reader(data):
+    """
+    Must be called from running event loop.
+    """
+    reader = asyncio.StreamReader()
+    reader.feed_data(bytes(data))
+    reader.feed_eof()
+    return reader
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def encode(spec, items, column_options=None):
+    from aioclickhouse.columns.service import get_column_by_spec
+
+    column = get_column_by_spec(spec, column_options)
+    writer = BufferWriter()
+    column.write_state_prefix(writer)
+    column.write_data(items, writer)
+    return bytes(writer.buffer)
+
+
+def decode(spec, data, n_items, column_options=None):
+    from aioclickhouse.columns.service import get_column_by_spec
+
+    async def read():
+        reader = make_reader(data)
+        column = get_column_by_spec(spec, column_options)
+        await column.read_state_prefix(reader)
+        items = await column.read_data(n_items, reader)
+        assert await reader.read() == b'', 'Data left unread'
+        return items
+
+    return run(read())
+
+
+def roundtrip(spec, items, column_options=None):
+    """
+    Encodes items, decodes them back and checks that decoded data
+    encodes to the same bytes.
+    """
+    data = encode(spec, items, column_options)
+    decoded = decode(spec, data, len(items), column_options)
+    assert encode(spec, decoded, column_options) == data
+    return decoded